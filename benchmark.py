@@ -0,0 +1,287 @@
+"""MotorController 확장성 벤치마크 (축 수 × SYNC 주기)
+
+실제 드라이브 대신 python-can 'virtual' 버스 위의 SimulatedZeroErrDrive N개를 상대로
+CSP 사이클(CycleExecutor)을 돌리며 다음 값을 측정하고 JSON 파일로 저장한다.
+  - 사이클당 CPU 시간 (프로세스 전체, 컨트롤러 수신(notifier) 스레드, 사이클 스레드, 시뮬레이터 스레드)
+  - 컨트롤러 수신 스레드 busy 비율 (스레드 CPU 시간 / 측정 시간)
+  - setpoint → 피드백 지연 (축별 LatencyTracker 통계를 합산, 백분위/최대는 가장 나쁜 축)
+    setpoint는 SYNC 직후 보내고 다음 SYNC에 적용되므로 지연은 한 주기 안팎이어야 한다.
+    다른 사이클의 피드백이 응답으로 잡힌 수(latency_early)가 0이 아니면 지연 값은 믿을 수 없다.
+  - 놓친 TPDO 수 (시뮬레이터가 보낸 수 - 컨트롤러가 받은 수), 미완성 사이클 스냅샷 수
+  - 사이클 overrun (CycleExecutor가 늦어서 건너뛴 사이클 수, SYNC 전송 지연)
+
+시뮬레이터도 같은 프로세스(GIL)에서 실행되므로 결과는 실제 버스보다 보수적이다.
+시뮬레이터 스레드 CPU는 따로 기록한다.
+
+예) python benchmark.py --axes 1 8 32 127 --periods 0.01 0.005 0.002 0.001 --duration 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import can
+import canopen
+import numpy as np
+
+from motor_management.motor_controller import MotorController
+from motor_vendor.motorVendorZeroErr import MotorVendorZeroErr
+from motor_vendor.simulatedZeroErr import SimulatedZeroErrNetwork, DEFAULT_EDS_PATH
+
+DEFAULT_AXES = [1, 4, 16, 32, 64, 127]
+DEFAULT_PERIODS = [0.01, 0.005, 0.002, 0.001]
+
+
+class ThreadProbe(can.Listener):
+    """notifier에 붙여 수신 스레드의 ident를 알아내고, 그 스레드의 CPU 시간을 읽는다 (Linux)"""
+
+    def __init__(self):
+        self.ident = None
+
+    def on_message_received(self, msg):
+        if self.ident is None:
+            self.ident = threading.get_ident()
+
+    def cpu_time(self):
+        return thread_cpu_time(self.ident)
+
+
+def thread_cpu_time(ident):
+    """스레드 CPU 시간[s] (지원하지 않는 플랫폼이거나 스레드를 모르면 None)"""
+    if ident is None or not hasattr(time, 'pthread_getcpuclockid'):
+        return None
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (OSError, ProcessLookupError):
+        return None
+
+
+def _delta(end, start):
+    if end is None or start is None:
+        return None
+    return end - start
+
+
+def _per_cycle(value, cycles):
+    if value is None or not cycles:
+        return None
+    return value / cycles
+
+
+def run_case(axes, period, duration, warmup, mode, channel, verbose=False):
+    """축 수 axes, SYNC 주기 period[s]로 한 번 측정"""
+    node_ids = list(range(1, axes + 1))
+    sim = SimulatedZeroErrNetwork(channel, node_ids)
+    controller = MotorController(channel=channel, interface='virtual', receive_own_messages=True)
+    try:
+        for node_id in node_ids:
+            controller.add_motor(MotorVendorZeroErr(node_id, DEFAULT_EDS_PATH, operation_mode=mode))
+        bringup_start = time.perf_counter()
+        output = None if verbose else io.StringIO()
+        with contextlib.redirect_stdout(output) if output is not None else contextlib.nullcontext():
+            controller.all_motors_init_start(period, parallel=True)
+        bringup_time = time.perf_counter() - bringup_start
+
+        # 축마다 위상이 다른 사인파 궤적 (pulse)
+        base = controller.state.target_position[:axes].copy()
+        phase = np.linspace(0, 2 * math.pi, axes, endpoint=False)
+        amplitude = 65536.0
+
+        executor_thread = []
+
+        def callback(cycle, ctrl):
+            if not executor_thread:
+                executor_thread.append(threading.get_ident())
+            return base + amplitude * np.sin(2 * math.pi * cycle * period + phase)
+
+        controller_probe = ThreadProbe()
+        sim_probe = ThreadProbe()
+        controller.network.notifier.add_listener(controller_probe)
+        sim.network.notifier.add_listener(sim_probe)
+
+        executor = controller.cycle_start(period, callback)
+        controller.sync_monitor_start()
+        time.sleep(warmup)
+
+        # 측정 구간 시작 값
+        controller.latency_start_all()
+        executor_ident = executor_thread[0] if executor_thread else None
+        start = {
+            'wall': time.perf_counter(),
+            'process': time.process_time(),
+            'notifier': controller_probe.cpu_time(),
+            'executor': thread_cpu_time(executor_ident),
+            'sim': sim_probe.cpu_time(),
+            'cycles': executor.cycle,
+            'missed': executor.missed,
+            'tpdo_sent': sum(drive.tpdo_sent for drive in sim.drives.values()),
+            'tpdo_received': int(controller.state.rx_count[:axes].sum()),
+            'snapshots': controller.state.cycle,
+            'incomplete': controller.state.incomplete,
+            'missing_tpdo': int(controller.sync_monitor.missing_tpdo.sum()),
+        }
+        time.sleep(duration)
+        end = {
+            'wall': time.perf_counter(),
+            'process': time.process_time(),
+            'notifier': controller_probe.cpu_time(),
+            'executor': thread_cpu_time(executor_ident),
+            'sim': sim_probe.cpu_time(),
+            'cycles': executor.cycle,
+            'missed': executor.missed,
+            'tpdo_sent': sum(drive.tpdo_sent for drive in sim.drives.values()),
+            'tpdo_received': int(controller.state.rx_count[:axes].sum()),
+            'snapshots': controller.state.cycle,
+            'incomplete': controller.state.incomplete,
+            'missing_tpdo': int(controller.sync_monitor.missing_tpdo.sum()),
+        }
+        controller.cycle_stop()
+        cycle_stats = executor.get_stats()
+        latency = list(controller.get_latency_stats().values())
+        sync_stats = controller.get_sync_stats()
+    finally:
+        controller.disconnect()
+        sim.close()
+
+    elapsed = end['wall'] - start['wall']
+    cycles = end['cycles'] - start['cycles']
+    notifier_cpu = _delta(end['notifier'], start['notifier'])
+    latency_count = sum(stats['count'] for stats in latency)
+    latency_cycles = [cycles for stats in latency for cycles in stats['cycles']]
+    return {
+        'axes': axes,
+        'period': period,
+        'mode': mode,
+        'duration': elapsed,
+        'bringup_time': bringup_time,
+        'cycles': cycles,
+        'missed_cycles': end['missed'] - start['missed'],
+        'lateness_mean': cycle_stats['lateness_mean'],
+        'lateness_p99': cycle_stats['lateness_p99'],
+        'lateness_max': cycle_stats['lateness_max'],
+        'cpu_per_cycle': _per_cycle(end['process'] - start['process'], cycles),
+        'notifier_cpu_per_cycle': _per_cycle(notifier_cpu, cycles),
+        'notifier_busy': notifier_cpu / elapsed if notifier_cpu is not None else None,
+        'executor_cpu_per_cycle': _per_cycle(_delta(end['executor'], start['executor']), cycles),
+        'sim_cpu_per_cycle': _per_cycle(_delta(end['sim'], start['sim']), cycles),
+        'tpdo_sent': end['tpdo_sent'] - start['tpdo_sent'],
+        'tpdo_received': end['tpdo_received'] - start['tpdo_received'],
+        # 측정 끝에 아직 전달 중이던 프레임은 놓친 것으로 세지 않도록 사이클당 TPDO 수(축당 2개)만큼 빼준다
+        'tpdo_dropped': max(0, (end['tpdo_sent'] - start['tpdo_sent'])
+                            - (end['tpdo_received'] - start['tpdo_received']) - 2 * axes),
+        'missing_tpdo': end['missing_tpdo'] - start['missing_tpdo'],
+        'snapshots': end['snapshots'] - start['snapshots'],
+        'incomplete_snapshots': end['incomplete'] - start['incomplete'],
+        'sync_jitter_p99': sync_stats['jitter_p99'] if sync_stats else None,
+        'latency_count': latency_count,
+        'latency_early': sum(stats['early'] for stats in latency),
+        'latency_cycles_min': min(latency_cycles, default=None),  # 응답까지 걸린 최소 SYNC 수 (1 이상)
+        'latency_mean': (sum(stats['mean'] * stats['count'] for stats in latency) / latency_count
+                         if latency_count else None),
+        'latency_min': min((stats['min'] for stats in latency if stats['count']), default=None),
+        'latency_p50': max((stats['p50'] for stats in latency if stats['count']), default=None),
+        'latency_p99': max((stats['p99'] for stats in latency if stats['count']), default=None),
+        'latency_max': max((stats['max'] for stats in latency if stats['count']), default=None),
+    }
+
+
+def latency_valid(result):
+    """지연 측정이 SYNC 기준으로 맞게 잡혔는지 (모든 응답이 다음 SYNC 이후, 이전 사이클 피드백 없음)"""
+    if not result['latency_count']:
+        return True
+    return result['latency_early'] == 0 and result['latency_cycles_min'] >= 1
+
+
+def keeps_up(result):
+    """사이클을 건너뛰거나 TPDO를 놓치지 않고 따라갔는지"""
+    return result['missed_cycles'] == 0 and result['tpdo_dropped'] == 0 and result['incomplete_snapshots'] == 0
+
+
+def max_axes(results):
+    """SYNC 주기별로 끝까지 따라간 최대 축 수 (작은 축 수부터 처음 실패하기 전까지)"""
+    summary = {}
+    for period in sorted({result['period'] for result in results}, reverse=True):
+        best = 0
+        for result in sorted((r for r in results if r['period'] == period), key=lambda r: r['axes']):
+            if not keeps_up(result):
+                break
+            best = result['axes']
+        summary[str(period)] = best
+    return summary
+
+
+def environment():
+    """결과 비교용 실행 환경 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'canopen': canopen.__version__,
+        'python_can': can.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MotorController 확장성 벤치마크 (simulated drive, virtual bus)")
+    parser.add_argument('--axes', type=int, nargs='+', default=DEFAULT_AXES, help="축 수 목록 (최대 127)")
+    parser.add_argument('--periods', type=float, nargs='+', default=DEFAULT_PERIODS, help="SYNC 주기 목록[s]")
+    parser.add_argument('--duration', type=float, default=3.0, help="조합별 측정 시간[s]")
+    parser.add_argument('--warmup', type=float, default=0.5, help="측정 전 대기 시간[s]")
+    parser.add_argument('--mode', default='CYCLIC_SYNC_POSITION', help="동작 모드")
+    parser.add_argument('--output', default=None, help="결과 JSON 경로 (기본: benchmark_<timestamp>.json)")
+    parser.add_argument('--verbose', action='store_true', help="bring-up 출력 표시")
+    args = parser.parse_args()
+
+    for axes in args.axes:
+        if not 1 <= axes <= 127:
+            parser.error(f"축 수는 1 ~ 127이어야 합니다: {axes}")
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    results = []
+    for period in args.periods:
+        for axes in args.axes:
+            channel = f"benchmark_{axes}_{period}"
+            result = run_case(axes, period, args.duration, args.warmup, args.mode, channel, args.verbose)
+            results.append(result)
+            cpu = result['cpu_per_cycle']
+            busy = result['notifier_busy']
+            print(f"[benchmark] axes {axes:3d}, period {period * 1000:5.1f} ms: "
+                  f"cpu/cycle {cpu * 1e6 if cpu is not None else float('nan'):8.1f} us, "
+                  f"notifier busy {busy * 100 if busy is not None else float('nan'):5.1f}%, "
+                  f"missed {result['missed_cycles']}, dropped TPDO {result['tpdo_dropped']}, "
+                  f"latency p50 {(result['latency_p50'] or 0) * 1000:.2f} ms, "
+                  f"p99 {(result['latency_p99'] or 0) * 1000:.2f} ms")
+            if not latency_valid(result):
+                print(f"[benchmark] 경고: 이전 사이클 피드백이 응답으로 잡힘 (early {result['latency_early']}), "
+                      f"지연 값을 신뢰할 수 없음")
+
+    report = {
+        'environment': environment(),
+        'parameters': vars(args),
+        'max_axes': max_axes(results),
+        'results': results,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[benchmark] 최대 축 수 (SYNC 주기별): {report['max_axes']}")
+    print(f"[benchmark] 결과 저장: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from .fleet_state import FleetState
+from .estimators import create_estimator
+from .latency import LatencyTracker
+from .clock import system_clock
 
 class AbstractMotor(ABC):
     """모든 모터가 공통으로 가져야 할 인터페이스 정의(추상 클래스)."""
@@ -21,17 +25,108 @@ class AbstractMotor(ABC):
         self.eds_path = eds_path
         self.node = None  # canopen에서 로드되는 노드 객체 (초기에는 None)
         self.network = None  # network 객체 추가
-        # 목표 위치와 현재 위치를 저장하는 변수 추가
-        self.zero_offset = zero_offset
-
-        self.target_position = 0    # 목표 위치값 저장용 변수
-        self.target_torque = 0      # 목표 토크값 저장용 변수
+        self.dt = 0.01  # SYNC 주기[s], sync_start에서 갱신
+        self.clock = system_clock  # 대기/시각 기준 (컨트롤러에 등록되면 컨트롤러의 시계)
 
-        self.current_position = 0       # 현재 위치값 저장용 변수
-        self.current_torque_sensor = 0  # 현재 토크값 저장용 변수
-        self.current_velocity = 0       # 현재 속도값 저장용 변수
-        self.current_velocity_old = 0   # 이전 속도값 저장용 변수
-        self.current_acceleration = 0   # 현재 가속도값 저장용 변수
+        # 목표값, 영점 오프셋, 현재 피드백 값은 FleetState 배열에 저장된다.
+        # (컨트롤러에 등록되면 컨트롤러의 저장소로 옮겨감)
+        self.state = None
+        self.bind_state(FleetState(1), 0)
+        self.zero_offset = zero_offset
+        # 측정 속도와 수신 시각으로 가속도를 구하는 추정기
+        self.estimator = create_estimator('finite_difference')
+        # latency_start로 생성되는 setpoint → 피드백 지연 측정기
+        self.latency = None
+
+    def bind_state(self, state, slot):
+        """피드백 저장소(FleetState)와 slot 지정 (기존 저장소의 값은 새 slot으로 복사)"""
+        if self.state is not None:
+            state.copy_axis(self.state, self.slot, slot)
+        self.state = state
+        self.slot = slot
+
+    # 목표값과 축 설정 (FleetState 배열의 이 축 slot)
+    @property
+    def zero_offset(self):
+        return self.state.zero_offset[self.slot]
+
+    @zero_offset.setter
+    def zero_offset(self, value):
+        self.state.zero_offset[self.slot] = value
+
+    @property
+    def position_scale(self):
+        """위치 1 단위(드라이브 단위)당 rad"""
+        return self.state.position_scale[self.slot]
+
+    @position_scale.setter
+    def position_scale(self, value):
+        self.state.position_scale[self.slot] = value
+
+    @property
+    def target_position(self):
+        return self.state.target_position[self.slot]
+
+    @target_position.setter
+    def target_position(self, value):
+        self.state.target_position[self.slot] = value
+
+    @property
+    def target_velocity(self):
+        return self.state.target_velocity[self.slot]
+
+    @target_velocity.setter
+    def target_velocity(self, value):
+        self.state.target_velocity[self.slot] = value
+
+    @property
+    def target_torque(self):
+        return self.state.target_torque[self.slot]
+
+    @target_torque.setter
+    def target_torque(self, value):
+        self.state.target_torque[self.slot] = value
+
+    # 현재 피드백 값 (FleetState 배열의 이 축 slot)
+    @property
+    def statusword(self):
+        return int(self.state.statusword[self.slot])
+
+    @statusword.setter
+    def statusword(self, value):
+        self.state.statusword[self.slot] = value
+
+    @property
+    def current_position(self):
+        return self.state.position[self.slot]
+
+    @current_position.setter
+    def current_position(self, value):
+        self.state.position[self.slot] = value
+
+    @property
+    def current_torque_sensor(self):
+        return self.state.torque[self.slot]
+
+    @current_torque_sensor.setter
+    def current_torque_sensor(self, value):
+        self.state.torque[self.slot] = value
+
+    @property
+    def current_velocity(self):
+        return self.state.velocity[self.slot]
+
+    @current_velocity.setter
+    def current_velocity(self, value):
+        self.state.velocity[self.slot] = value
+
+    @property
+    def current_acceleration(self):
+        return self.state.acceleration[self.slot]
+
+    @current_acceleration.setter
+    def current_acceleration(self, value):
+        self.state.acceleration[self.slot] = value
 
     @abstractmethod
     def init(self):
@@ -48,8 +143,10 @@ class AbstractMotor(ABC):
         pass
 
     @abstractmethod
-    def pdo_mapping(self):
-        """PDO 매핑 설정"""
+    def pdo_mapping(self, verify=True):
+        """PDO 매핑 설정 (verify=True면 이미 같은 매핑인 PDO는 다시 쓰지 않음)
+        :return: 새로 쓴 PDO 목록 (비어 있으면 이미 설정된 상태, None이면 확인하지 않음)
+        """
         pass
 
     @abstractmethod
@@ -57,6 +154,30 @@ class AbstractMotor(ABC):
         """Switch On 명령"""
         pass
 
+    def set_estimator(self, estimator='finite_difference', **kwargs):
+        """가속도 추정기 설정
+        :param estimator: 'finite_difference', 'alpha_beta', 'polyfit' 또는 update(velocity, timestamp, nominal_dt)를 가진 클래스
+        :param kwargs: 추정기 생성 인자 (예: alpha=0.5, beta=0.1 / window=8, order=2)
+        """
+        self.estimator = create_estimator(estimator, **kwargs)
+
+    def latency_start(self, bin_width=0.0001, max_latency=0.1, sync_period=None):
+        """setpoint 전송 → 피드백 반영 지연 측정 시작 (기존 측정값은 초기화)
+        :param bin_width: 히스토그램 bin 폭[s]
+        :param max_latency: 히스토그램 범위[s]
+        :param sync_period: SYNC 주기[s] (None이면 self.dt, 잘못된 사이클의 피드백 검사용)
+        """
+        self.latency = LatencyTracker(bin_width, max_latency, sync_period or self.dt)
+
+    def latency_stop(self):
+        self.latency = None
+
+    def get_latency_stats(self):
+        """지연 통계 (count, superseded, early, mean, min, p50, p99, max [s], cycles), 측정 중이 아니면 None"""
+        if self.latency is None:
+            return None
+        return self.latency.get_stats()
+
     def set_zero_offset(self, value):
         """Zero Offset 변경"""
         self.zero_offset = value
@@ -76,6 +197,12 @@ class AbstractMotor(ABC):
         """모터 위치 명령"""
         pass
 
+    def send_target_position(self, target):
+        """zero offset과 단위 변환이 끝난 목표 위치(드라이브 단위) 전송 (일괄 setpoint용)
+        제조사 구현에서 프레임을 바로 보내도록 재정의할 수 있다.
+        """
+        self.set_position(target - self.zero_offset)
+
     @abstractmethod
     def get_position(self):
         """모터 위치 확인"""
@@ -86,6 +213,10 @@ class AbstractMotor(ABC):
         """모터 토크 명령"""
         pass
 
+    def send_target_torque(self, target):
+        """목표 토크(드라이브 단위) 전송 (일괄 setpoint용)"""
+        self.set_torque(target)
+
     @abstractmethod
     def get_torque(self):
         """모터 토크 확인"""
@@ -0,0 +1,165 @@
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = b'RCMLOG1\0'
+VERSION = 1
+DTYPE = '<f8'
+# magic(8) + 헤더 길이(uint32)
+_PREFIX = struct.Struct('<8sI')
+_ALIGN = 64
+
+
+class BinaryLogWriter:
+    """고정 폭 레코드(float64 열)로 된 바이너리 로그 파일 기록기.
+
+    파일 구조: magic, 헤더 길이, JSON 헤더(열 이름/단위/축 ID/샘플 주기), 64바이트 정렬 패딩, 레코드들.
+    레코드 수는 헤더에 쓰지 않고 파일 크기로 계산하므로 기록 도중 종료되어도 기록된 레코드까지 읽을 수 있다.
+    """
+
+    def __init__(self, filename, columns, units, axes=None, sample_period=None, metadata=None):
+        """
+        :param filename: 파일 경로
+        :param columns: 열 이름 목록
+        :param units: 열별 단위 목록
+        :param axes: 열별 축(node_id) 목록 (축과 무관한 열은 None). None이면 모두 None
+        :param sample_period: 샘플 주기[s] (알 수 없으면 None)
+        :param metadata: 헤더에 함께 저장할 추가 정보 (JSON으로 직렬화 가능해야 함)
+        """
+        if len(units) != len(columns):
+            raise ValueError("columns와 units의 길이가 다릅니다")
+        axes = list(axes) if axes is not None else [None] * len(columns)
+        if len(axes) != len(columns):
+            raise ValueError("columns와 axes의 길이가 다릅니다")
+        self.filename = filename
+        self.columns = list(columns)
+        self.header = {
+            'version': VERSION,
+            'dtype': DTYPE,
+            'columns': self.columns,
+            'units': list(units),
+            'axes': axes,
+            'axis_ids': sorted({axis for axis in axes if axis is not None}),
+            'sample_period': sample_period,
+            'metadata': metadata or {},
+        }
+        self._file = None
+
+    def open(self, start_time):
+        """파일을 만들고 헤더 기록
+        :param start_time: 로그 시작 시각 (epoch[s], 헤더에 저장)
+        """
+        header = dict(self.header, start_time=start_time)
+        blob = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        # 레코드 영역이 정렬되도록 헤더 뒤를 공백으로 채운다
+        blob += b' ' * (-(_PREFIX.size + len(blob)) % _ALIGN)
+        self._file = open(self.filename, 'wb')
+        self._file.write(_PREFIX.pack(MAGIC, len(blob)))
+        self._file.write(blob)
+
+    def write(self, rows):
+        """레코드 기록
+        :param rows: (샘플 수, 열 수) 배열
+        """
+        np.ascontiguousarray(rows, dtype=DTYPE).tofile(self._file)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BinaryLog:
+    """BinaryLogWriter로 기록한 파일을 memory-map으로 여는 읽기 전용 로그.
+
+    data는 (레코드 수, 열 수) 형태의 np.memmap이므로 파싱 없이 필요한 부분만 디스크에서 읽힌다.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) != _PREFIX.size:
+                raise ValueError(f"바이너리 로그 파일이 아닙니다: {filename}")
+            magic, header_size = _PREFIX.unpack(prefix)
+            if magic != MAGIC:
+                raise ValueError(f"바이너리 로그 파일이 아닙니다: {filename}")
+            self.header = json.loads(f.read(header_size).decode('utf-8'))
+        if self.header.get('version') != VERSION:
+            raise ValueError(f"지원하지 않는 로그 버전입니다: {self.header.get('version')}")
+
+        self.columns = self.header['columns']
+        self.units = self.header['units']
+        self.axes = self.header['axes']
+        self.axis_ids = self.header['axis_ids']
+        self.sample_period = self.header['sample_period']
+        self.start_time = self.header['start_time']
+        self.metadata = self.header['metadata']
+
+        offset = _PREFIX.size + header_size
+        record_size = np.dtype(self.header['dtype']).itemsize * len(self.columns)
+        # 마지막 레코드가 덜 기록된 경우(기록 중 종료) 완전한 레코드까지만 사용
+        count = (os.path.getsize(filename) - offset) // record_size
+        if count:
+            self.data = np.memmap(filename, self.header['dtype'], 'r', offset, (count, len(self.columns)))
+        else:
+            self.data = np.zeros((0, len(self.columns)), self.header['dtype'])
+
+    def __len__(self):
+        return len(self.data)
+
+    def _index(self, name, axis=None):
+        for index, (column, column_axis) in enumerate(zip(self.columns, self.axes)):
+            if column == name and (axis is None or column_axis == axis):
+                return index
+        raise KeyError(f"'{name}' 열이 없습니다" + (f" (axis {axis})" if axis is not None else ''))
+
+    def column(self, name, axis=None):
+        """한 열의 값 (memmap view, 복사 없음)
+        :param axis: 같은 이름의 열이 축마다 있을 때 선택할 축 ID
+        """
+        return self.data[:, self._index(name, axis)]
+
+    def signal(self, name):
+        """축마다 있는 신호를 (레코드 수, 축 수) 배열로 반환 (열 순서는 axis_ids)"""
+        indices = [self._index(name, axis) for axis in self.axis_ids]
+        return self.data[:, indices]
+
+    def unit(self, name):
+        return self.units[self._index(name)]
+
+    def to_csv(self, csv_path=None, fmt='%.6f'):
+        """CSV 파일로 변환 (기본 경로는 확장자만 .csv로 바꾼 경로)
+        :return: 생성한 CSV 경로
+        """
+        if csv_path is None:
+            csv_path = os.path.splitext(self.filename)[0] + '.csv'
+        multi_axis = len(self.axis_ids) > 1
+        names = []
+        for column, unit, axis in zip(self.columns, self.units, self.axes):
+            name = f"{column}[{axis}]" if multi_axis and axis is not None else column
+            names.append(f"{name}({unit})" if unit else name)
+        with open(csv_path, 'w', newline='') as f:
+            f.write(','.join(names) + '\r\n')
+            np.savetxt(f, self.data, fmt=fmt, delimiter=',', newline='\r\n')
+        return csv_path
+
+
+def read_log(filename):
+    """바이너리 로그 파일 열기 (memory-map)"""
+    return BinaryLog(filename)
+
+
+def log_to_csv(filename, csv_path=None, fmt='%.6f'):
+    """바이너리 로그 파일을 CSV로 변환하고 CSV 경로 반환"""
+    return BinaryLog(filename).to_csv(csv_path, fmt)
+
+
+if __name__ == '__main__':
+    # python -m motor_management.binary_log motor_log_1_20250101_120000.bin ...
+    for path in sys.argv[1:]:
+        print(log_to_csv(path))
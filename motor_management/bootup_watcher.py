@@ -0,0 +1,67 @@
+import threading
+import time
+
+
+class BootupWatcher:
+    """NMT 리셋 후 각 노드의 boot-up / heartbeat(COB-ID 0x700+id) 수신을 기다리는 감시자.
+
+    리셋 명령을 보내기 전에 start()로 구독을 걸어두어야 boot-up 메시지를 놓치지 않는다.
+    """
+    HEARTBEAT_COB_BASE = 0x700
+    BOOTUP = 0x00            # boot-up 메시지
+    PRE_OPERATIONAL = 0x7F   # 리셋 직후 노드가 보고하는 heartbeat 상태
+
+    def __init__(self, network, node_ids):
+        self.network = network
+        self.node_ids = list(node_ids)
+        self._pending = set(self.node_ids)
+        self._condition = threading.Condition()
+        self.bootup_times = {}  # {node_id: 응답까지 걸린 시간[s]}
+        self._start_time = None
+
+    def start(self):
+        """0x700+id 구독 시작"""
+        self._start_time = time.perf_counter()
+        for node_id in self.node_ids:
+            self.network.subscribe(self.HEARTBEAT_COB_BASE + node_id, self._on_message)
+        return self
+
+    def stop(self):
+        """0x700+id 구독 해제"""
+        for node_id in self.node_ids:
+            self.network.unsubscribe(self.HEARTBEAT_COB_BASE + node_id, self._on_message)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _on_message(self, can_id, data, timestamp):
+        if not data:
+            return
+        state = data[0] & 0x7F  # toggle bit 제거
+        # boot-up 또는 리셋 직후의 PRE-OPERATIONAL heartbeat만 복귀로 인정한다.
+        # (Stop 이후 리셋 전까지의 heartbeat는 STOPPED 상태이므로 구분된다)
+        if state not in (self.BOOTUP, self.PRE_OPERATIONAL):
+            return
+        node_id = can_id - self.HEARTBEAT_COB_BASE
+        with self._condition:
+            if node_id in self._pending:
+                self._pending.discard(node_id)
+                self.bootup_times[node_id] = time.perf_counter() - self._start_time
+                self._condition.notify_all()
+
+    @property
+    def missing(self):
+        """아직 응답하지 않은 노드 ID 목록"""
+        with self._condition:
+            return sorted(self._pending)
+
+    def wait(self, timeout=5.0):
+        """모든 노드가 응답하거나 timeout이 지날 때까지 대기
+        :return: 응답하지 않은 노드 ID 목록 (모두 응답하면 빈 리스트)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending, timeout)
+            return sorted(self._pending)
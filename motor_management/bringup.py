@@ -0,0 +1,83 @@
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 노드별 실행 결과 (ok: 성공 여부, elapsed: 소요 시간[s], error: 발생한 예외 또는 None, value: 반환값)
+NodeResult = namedtuple('NodeResult', ['ok', 'elapsed', 'error', 'value'])
+
+
+class BringUpError(RuntimeError):
+    """하나 이상의 노드에서 초기화 단계가 실패했을 때 발생하는 예외."""
+
+    def __init__(self, report):
+        self.report = report
+        failed = ', '.join(str(node_id) for node_id in report.failed)
+        super().__init__(f"[{report.step}] 실패한 노드: {failed}")
+
+
+class BringUpReport:
+    """노드별 초기화 단계의 결과와 소요 시간을 모아두는 리포트."""
+
+    def __init__(self, step, parallel):
+        self.step = step
+        self.parallel = parallel
+        self.results = {}   # {node_id: NodeResult}
+        self.elapsed = 0.0  # 단계 전체 소요 시간[s]
+
+    @property
+    def failed(self):
+        """실패한 노드 ID 목록"""
+        return [node_id for node_id, result in self.results.items() if not result.ok]
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    @property
+    def slowest(self):
+        """가장 오래 걸린 노드 ID (노드가 없으면 None)"""
+        if not self.results:
+            return None
+        return max(self.results, key=lambda node_id: self.results[node_id].elapsed)
+
+    def print_summary(self):
+        mode = '병렬' if self.parallel else '순차'
+        print(f"[BringUp] {self.step} ({mode}) 완료: {self.elapsed * 1000:.1f} ms, "
+              f"노드 {len(self.results)}개, 실패 {len(self.failed)}개")
+        for node_id, result in sorted(self.results.items()):
+            status = 'OK' if result.ok else f'FAIL ({result.error!r})'
+            print(f"  node {node_id}: {result.elapsed * 1000:.1f} ms {status}")
+
+
+def run_per_node(motors, step, parallel=False, max_workers=None, **kwargs):
+    """등록된 모든 모터에 대해 step 메서드를 실행하고 노드별 결과를 수집한다.
+
+    :param motors: {node_id: AbstractMotor} 딕셔너리
+    :param step: 실행할 모터 메서드 이름 (예: 'init', 'reset', 'pdo_mapping')
+    :param parallel: True면 노드별 SDO 시퀀스를 스레드 풀에서 동시에 실행
+    :param max_workers: 동시에 실행할 최대 노드 수 (None이면 노드 수만큼)
+    :param kwargs: step 메서드에 그대로 전달할 인자
+    :return: BringUpReport
+    """
+    report = BringUpReport(step, parallel)
+
+    def _run(motor):
+        start = time.perf_counter()
+        try:
+            value = getattr(motor, step)(**kwargs)
+        except Exception as e:
+            return NodeResult(False, time.perf_counter() - start, e, None)
+        return NodeResult(True, time.perf_counter() - start, None, value)
+
+    start = time.perf_counter()
+    if parallel and len(motors) > 1:
+        workers = min(max_workers or len(motors), len(motors))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'bringup-{step}') as pool:
+            futures = {node_id: pool.submit(_run, motor) for node_id, motor in motors.items()}
+            for node_id, future in futures.items():
+                report.results[node_id] = future.result()
+    else:
+        for node_id, motor in motors.items():
+            report.results[node_id] = _run(motor)
+    report.elapsed = time.perf_counter() - start
+    return report
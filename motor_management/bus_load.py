@@ -0,0 +1,204 @@
+import threading
+from collections import deque
+
+import can
+
+from .clock import system_clock
+
+# 비트 스터핑 대상이 아닌 고정 구간: CRC delimiter(1) + ACK(2) + EOF(7) + IFS(3)
+_TRAILER_BITS = 13
+# 노드 ID가 없는 브로드캐스트 COB-ID (NMT, SYNC, TIME)
+_BROADCAST_COB_IDS = (0x000, 0x080, 0x100)
+
+
+def _frame_fields(msg):
+    """SOF부터 데이터 필드까지의 비트열 (정수, 비트 수)"""
+    dlc = 0 if msg.is_remote_frame else len(msg.data)
+    rtr = 1 if msg.is_remote_frame else 0
+    if msg.is_extended_id:
+        arbitration_id = msg.arbitration_id
+        # SOF, base ID(11), SRR(1), IDE(1), extended ID(18), RTR, r1, r0
+        bits = (((arbitration_id >> 18) & 0x7FF) << 2 | 0b11) << 18 | (arbitration_id & 0x3FFFF)
+        bits = (bits << 3 | rtr << 2) << 4 | (msg.dlc & 0xF)
+        length = 1 + 11 + 2 + 18 + 3 + 4
+    else:
+        # SOF, ID(11), RTR, IDE, r0
+        bits = ((msg.arbitration_id & 0x7FF) << 3 | rtr << 2) << 4 | (msg.dlc & 0xF)
+        length = 1 + 11 + 3 + 4
+    if dlc:
+        bits = bits << (8 * dlc) | int.from_bytes(msg.data, 'big')
+        length += 8 * dlc
+    return bits, length
+
+
+def _crc15(bits, length):
+    crc = 0
+    for shift in range(length - 1, -1, -1):
+        feedback = ((bits >> shift) & 1) ^ ((crc >> 14) & 1)
+        crc = (crc << 1) & 0x7FFF
+        if feedback:
+            crc ^= 0x4599
+    return crc
+
+
+def frame_bits(msg, stuffing='worst'):
+    """프레임 하나가 버스를 차지하는 비트 수 (프레임 간 간격 IFS 포함)
+    :param stuffing: 'exact'(CRC까지 계산해 실제 stuff 비트 수), 'worst'(최대 stuff 비트 수), 'none'
+    """
+    dlc = 0 if msg.is_remote_frame else len(msg.data)
+    stuffed = (54 if msg.is_extended_id else 34) + 8 * dlc  # SOF ~ CRC 비트 수
+    if stuffing == 'none':
+        return stuffed + _TRAILER_BITS
+    if stuffing == 'worst':
+        return stuffed + (stuffed - 1) // 4 + _TRAILER_BITS
+    if stuffing != 'exact':
+        raise ValueError(f"지원하지 않는 stuffing 방식입니다: {stuffing}")
+
+    bits, length = _frame_fields(msg)
+    bits = bits << 15 | _crc15(bits, length)
+    length += 15
+    # 같은 값이 5비트 연속되면 반대 비트를 하나 넣는다 (넣은 비트도 다음 연속 구간에 포함)
+    stuff = 0
+    run = 0
+    previous = -1
+    for shift in range(length - 1, -1, -1):
+        bit = (bits >> shift) & 1
+        if bit == previous:
+            run += 1
+        else:
+            previous = bit
+            run = 1
+        if run == 5:
+            stuff += 1
+            previous = bit ^ 1
+            run = 1
+    return length + stuff + _TRAILER_BITS
+
+
+def cob_node(cob_id):
+    """COB-ID의 노드 ID (NMT/SYNC/TIME 등 브로드캐스트는 None)"""
+    if cob_id in _BROADCAST_COB_IDS:
+        return None
+    return cob_id & 0x7F
+
+
+class BusLoadMonitor(can.Listener):
+    """수신한 모든 프레임의 수와 비트 수를 COB-ID별로 세어 버스 점유율을 계산하는 수동 리스너.
+
+    bucket 단위로 집계해 최근 window 구간의 값만 유지한다. (sliding window)
+    내가 보낸 프레임도 세려면 버스가 자기 프레임을 돌려주도록(receive_own_messages=True) 연결되어 있어야 한다.
+    """
+
+    def __init__(self, bitrate, window=1.0, bucket=0.1, stuffing='worst', clock=system_clock):
+        """
+        :param bitrate: 버스 속도[bit/s]
+        :param window: 점유율을 계산할 구간[s]
+        :param bucket: 집계 단위[s]
+        :param stuffing: 비트 수 계산 방식 ('exact', 'worst', 'none', frame_bits 참고)
+        :param clock: get_stats의 기준 시각 (프레임 timestamp와 같은 시계)
+        """
+        self.bitrate = bitrate
+        self.clock = clock
+        self.window = window
+        self.bucket = bucket
+        self.stuffing = stuffing
+        frame_bits(can.Message(), stuffing)  # stuffing 값 확인
+
+        self.frames = 0   # 누적 프레임 수
+        self.bits = 0     # 누적 비트 수
+        self._buckets = deque()  # (시작 시각, {cob_id: [프레임 수, 비트 수]})
+        self._current = None
+        self._current_start = 0.0
+        self._summary_thread = None
+        self._summary_stop = threading.Event()
+
+    def on_message_received(self, msg):
+        if msg.is_error_frame:
+            return
+        timestamp = msg.timestamp
+        if self._current is None or timestamp - self._current_start >= self.bucket:
+            self._rotate(timestamp)
+        bits = frame_bits(msg, self.stuffing)
+        entry = self._current.get(msg.arbitration_id)
+        if entry is None:
+            self._current[msg.arbitration_id] = [1, bits]
+        else:
+            entry[0] += 1
+            entry[1] += bits
+        self.frames += 1
+        self.bits += bits
+
+    def _rotate(self, timestamp):
+        # 새 bucket을 만들고 window를 벗어난 bucket은 버린다
+        self._current = {}
+        self._current_start = timestamp
+        buckets = self._buckets
+        buckets.append((timestamp, self._current))
+        while buckets and buckets[0][0] < timestamp - self.window - self.bucket:
+            buckets.popleft()
+
+    def get_stats(self, window=None, now=None):
+        """최근 window[s] 동안의 버스 사용량
+        :param now: 기준 시각 (None이면 현재 시각, 프레임 timestamp와 같은 시계)
+        :return: {'window', 'frames', 'bits', 'utilization', 'by_cob_id': {...}, 'by_node': {...}}
+                 by_cob_id/by_node 항목: {'frames', 'bits', 'fps', 'utilization'} (by_node의 키 None은 브로드캐스트)
+        """
+        window = min(window or self.window, self.window)
+        now = self.clock.time() if now is None else now
+        start = now - window
+        by_cob_id = {}
+        for bucket_start, counts in list(self._buckets):
+            if bucket_start < start:
+                continue
+            for cob_id, (frames, bits) in list(counts.items()):
+                entry = by_cob_id.setdefault(cob_id, [0, 0])
+                entry[0] += frames
+                entry[1] += bits
+
+        capacity = self.bitrate * window
+        by_node = {}
+        for cob_id, (frames, bits) in by_cob_id.items():
+            entry = by_node.setdefault(cob_node(cob_id), [0, 0])
+            entry[0] += frames
+            entry[1] += bits
+
+        def summarize(frames, bits):
+            return {'frames': frames, 'bits': bits, 'fps': frames / window, 'utilization': bits / capacity}
+
+        total_frames = sum(frames for frames, bits in by_cob_id.values())
+        total_bits = sum(bits for frames, bits in by_cob_id.values())
+        return {
+            'window': window,
+            'frames': total_frames,
+            'bits': total_bits,
+            'utilization': total_bits / capacity,
+            'by_cob_id': {cob_id: summarize(*entry) for cob_id, entry in sorted(by_cob_id.items())},
+            'by_node': {node: summarize(*entry)
+                        for node, entry in sorted(by_node.items(), key=lambda item: -1 if item[0] is None else item[0])},
+        }
+
+    def print_summary(self, window=None):
+        stats = self.get_stats(window)
+        print(f"[BusLoad] {stats['window']:.1f}s: {stats['utilization'] * 100:.1f}% "
+              f"({stats['frames'] / stats['window']:.0f} frames/s, {self.bitrate / 1000:.0f} kbit/s)")
+        for node, entry in stats['by_node'].items():
+            name = 'broadcast' if node is None else f'node {node}'
+            print(f"  {name}: {entry['utilization'] * 100:.1f}% ({entry['fps']:.0f} frames/s)")
+
+    def start_summary(self, interval=1.0):
+        """interval[s]마다 print_summary() 실행"""
+        self.stop_summary()
+        self._summary_stop.clear()
+
+        def _run():
+            while not self._summary_stop.wait(interval):
+                self.print_summary()
+
+        self._summary_thread = threading.Thread(target=_run, name='bus-load-summary', daemon=True)
+        self._summary_thread.start()
+
+    def stop_summary(self):
+        if self._summary_thread is not None:
+            self._summary_stop.set()
+            self._summary_thread.join()
+            self._summary_thread = None
@@ -0,0 +1,39 @@
+STANDARD_MASK = 0x7FF
+FUNCTION_MASK = 0x780  # COB-ID 상위 4비트 (function code), 하위 7비트는 노드 ID
+# socketcan 커널 필터 최대 개수 (CAN_RAW_FILTER_MAX)
+MAX_FILTERS = 512
+
+
+def subscribed_cob_ids(network):
+    """canopen Network에 콜백이 등록된 11비트 COB-ID 목록"""
+    return sorted(cob_id for cob_id, callbacks in network.subscribers.items()
+                  if callbacks and cob_id <= STANDARD_MASK)
+
+
+def build_filters(cob_ids, limit=MAX_FILTERS):
+    """COB-ID 목록을 python-can 필터 목록으로 변환
+    COB-ID마다 정확히 일치하는 필터를 만들고, limit를 넘으면 COB-ID가 많은 function code부터
+    function code 전체(노드 ID 0~127)를 받는 필터 하나로 합친다.
+    :return: [{'can_id', 'can_mask', 'extended'}] (COB-ID가 없으면 None = 모든 프레임 수신)
+    """
+    groups = {}
+    for cob_id in cob_ids:
+        groups.setdefault(cob_id & FUNCTION_MASK, []).append(cob_id)
+    if not groups:
+        return None
+
+    merged = set()
+    count = sum(len(members) for members in groups.values())
+    for function, members in sorted(groups.items(), key=lambda item: -len(item[1])):
+        if count <= limit:
+            break
+        merged.add(function)
+        count -= len(members) - 1
+
+    filters = []
+    for function, members in sorted(groups.items()):
+        if function in merged:
+            filters.append({'can_id': function, 'can_mask': FUNCTION_MASK, 'extended': False})
+        else:
+            filters.extend({'can_id': cob_id, 'can_mask': STANDARD_MASK, 'extended': False} for cob_id in members)
+    return filters
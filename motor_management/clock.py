@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class SystemClock:
+    """실제 시계 (기본값)"""
+    realtime = True
+
+    def time(self):
+        """현재 시각[s] (CAN 메시지 timestamp와 같은 기준)"""
+        return time.time()
+
+    def monotonic(self):
+        """데드라인 계산용 단조 시각[s]"""
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class ClockTimer:
+    """VirtualClock.call_at / call_every로 등록한 타이머"""
+
+    def __init__(self, callback, period=None):
+        self.callback = callback
+        self.period = period
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class VirtualClock:
+    """결정적 가상 시계.
+
+    시간은 sleep()/advance()를 호출할 때만 진행되고 실제로 기다리지 않는다.
+    그 사이 데드라인이 지난 타이머(주기 SYNC, 사이클 실행기 등)는 시각 순서대로 호출한 스레드에서 실행된다.
+    'virtual' 인터페이스의 컨트롤러/시뮬레이터는 DirectBus로 프레임을 같은 스레드에서 바로 전달하므로
+    SYNC 전송이 반환될 때 그 사이클의 TPDO까지 처리되어 있고, 실제로 기다리는 시간 없이 제어 루프를 진행한다.
+    """
+    realtime = False
+
+    def __init__(self, start=0.0):
+        """
+        :param start: 시작 시각[s]
+        """
+        self._now = float(start)
+        self._timers = []  # (데드라인, 등록 순서, ClockTimer) heap
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+
+    def time(self):
+        return self._now
+
+    def monotonic(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        """seconds[s]만큼 시간을 진행"""
+        self.run_until(self._now + max(seconds, 0.0))
+
+    def run_until(self, deadline):
+        """deadline[s]까지 시간을 진행하며 그 사이의 타이머를 순서대로 실행"""
+        with self._lock:
+            timers = self._timers
+            while timers and timers[0][0] <= deadline:
+                when, _, timer = heapq.heappop(timers)
+                if timer.cancelled:
+                    continue
+                if when > self._now:
+                    self._now = when
+                if timer.period:
+                    self._schedule(when + timer.period, timer)
+                timer.callback()
+            if deadline > self._now:
+                self._now = deadline
+
+    def _schedule(self, when, timer):
+        heapq.heappush(self._timers, (when, next(self._sequence), timer))
+
+    def call_at(self, when, callback):
+        """when[s] 시각에 callback() 한 번 실행"""
+        timer = ClockTimer(callback)
+        with self._lock:
+            self._schedule(when, timer)
+        return timer
+
+    def call_every(self, period, callback, start=None):
+        """start[s](None이면 지금 + period)부터 period[s]마다 callback() 실행"""
+        timer = ClockTimer(callback, period)
+        with self._lock:
+            self._schedule(self._now + period if start is None else start, timer)
+        return timer
+
+
+# 컨트롤러, 모터, 시뮬레이터의 기본 시계
+system_clock = SystemClock()
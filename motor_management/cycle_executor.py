@@ -0,0 +1,170 @@
+import math
+import os
+import threading
+from array import array
+
+# callback이 축 종류별 setpoint를 돌려줄 때 쓰는 키 (MotorController.send_setpoints 인자)
+SETPOINT_KEYS = ('positions', 'velocities', 'torques')
+# 위치 setpoint(set_positions)를 받는 동작 모드
+POSITION_MODES = ('PROFILE_POSITION', 'INTERPOLATED_POSITION', 'CYCLIC_SYNC_POSITION')
+
+
+class CycleExecutor:
+    """절대 데드라인 기반의 실시간 사이클 실행기.
+
+    매 사이클 k에 대해
+      1) start + k*period 시점에 SYNC 전송
+      2) SYNC 후 phase_offset 시점에 callback(cycle, controller) 실행 (그 사이 TPDO 수신)
+      3) callback이 돌려준 setpoint 전송 (send_setpoints) → cyclic 모드에서는 다음 SYNC에 적용
+    데드라인은 단조 시계로 계산하고, 마지막 spin_threshold 구간은 sleep 대신 busy-wait으로 맞춘다.
+    컨트롤러의 시계가 가상 시계(VirtualClock)이면 스레드 대신 시계 타이머로 사이클을 실행한다.
+    """
+
+    def __init__(self, controller, period, callback, phase_offset=0.0, spin_threshold=0.0005,
+                 history=10000, priority=None, sync_counter=0):
+        """
+        :param controller: MotorController
+        :param period: 사이클 주기[s]
+        :param callback: callback(cycle, controller) → {'positions': ..., 'velocities': ..., 'torques': ...}
+                         (send_setpoints 인자, 필요한 키만), None, 또는 위치만 ({node_id: 위치}/축 순서 배열).
+                         위치만 돌려주는데 대상 축 중 위치 모드가 아닌 축이 있으면 전송하지 않고 errors로 센다.
+        :param phase_offset: SYNC 후 callback 실행까지의 고정 지연[s] (0 <= phase_offset < period)
+        :param spin_threshold: 데드라인 직전 busy-wait 구간[s]
+        :param history: 사이클별 지연(lateness)을 보관할 개수
+        :param priority: SCHED_FIFO 우선순위 (None이면 변경하지 않음, Linux 전용)
+        :param sync_counter: 0이 아니면 SYNC에 1 ~ sync_counter를 순환하는 counter 바이트를 붙인다 (2 ~ 240).
+                             건너뛴 사이클도 counter를 증가시키므로 수신 측에서 빠진 사이클을 정확히 알 수 있다.
+                             drive의 0x1019(synchronous counter overflow)가 같은 값이어야 한다.
+        """
+        if not 0 <= phase_offset < period:
+            raise ValueError(f"phase_offset은 0 이상 period 미만이어야 합니다: {phase_offset}")
+        self.controller = controller
+        self.period = period
+        self.callback = callback
+        self.phase_offset = phase_offset
+        self.spin_threshold = spin_threshold
+        self.priority = priority
+        if sync_counter and not 2 <= sync_counter <= 240:
+            raise ValueError(f"sync_counter는 2 ~ 240이어야 합니다: {sync_counter}")
+        self.sync_counter = sync_counter
+
+        self.cycle = 0          # 실행한 사이클 수
+        self.missed = 0         # 늦어서 건너뛴 사이클 수
+        self.errors = 0         # callback 예외 수
+        self.last_error = None
+        self.max_lateness = 0.0
+        self._lateness = array('d', bytes(8 * history))  # SYNC 전송 지연[s] 링 버퍼
+        self.clock = controller.clock
+        self._running = False
+        self._thread = None
+        self._timer = None  # 가상 시계 타이머
+        self._non_position = frozenset()  # 위치 모드가 아닌 축의 node_id (start에서 갱신)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._non_position = frozenset(node_id for node_id, motor in self.controller.motors.items()
+                                       if motor.operation_mode.upper() not in POSITION_MODES)
+        if not self.clock.realtime:
+            # 가상 시계: clock.sleep/advance를 호출하는 스레드에서 사이클이 진행된다
+            self._k = 0
+            self._timer = self.clock.call_every(self.period, self._virtual_cycle)
+            return
+        self._thread = threading.Thread(target=self._run, name='cycle-executor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sleep_until(self, deadline):
+        clock = self.clock
+        remaining = deadline - clock.monotonic()
+        if remaining > self.spin_threshold:
+            clock.sleep(remaining - self.spin_threshold)
+        while clock.monotonic() < deadline:
+            pass
+
+    def _set_priority(self):
+        if self.priority is None or not hasattr(os, 'sched_setscheduler'):
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+        except (PermissionError, OSError) as e:
+            print(f"[CycleExecutor] 실시간 우선순위 설정 실패: {e}")
+
+    def _run(self):
+        self._set_priority()
+        clock = self.clock
+        period = self.period
+        start = clock.monotonic() + period
+        k = 0
+        while self._running:
+            deadline = start + k * period
+            self._sleep_until(deadline)
+            self._send_sync(k, clock.monotonic() - deadline)
+            if self.phase_offset:
+                self._sleep_until(deadline + self.phase_offset)
+            self._run_callback()
+
+            # 다음 데드라인이 이미 지났으면 밀린 사이클을 몰아서 보내지 않고 건너뛴다
+            k += 1
+            behind = clock.monotonic() - (start + k * period)
+            if behind > 0:
+                skip = math.ceil(behind / period)
+                self.missed += skip
+                k += skip
+
+    def _virtual_cycle(self):
+        # 가상 시계 타이머: 데드라인에 정확히 호출되므로 지연과 건너뛴 사이클이 없다
+        self._send_sync(self._k, 0.0)
+        self._k += 1
+        if self.phase_offset:
+            self.clock.call_at(self.clock.monotonic() + self.phase_offset, self._run_callback)
+        else:
+            self._run_callback()
+
+    def _send_sync(self, k, lateness):
+        self.controller.send_sync(k % self.sync_counter + 1 if self.sync_counter else None)
+        self._lateness[self.cycle % len(self._lateness)] = lateness
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+    def _run_callback(self):
+        try:
+            setpoints = self.callback(self.cycle, self.controller)
+            if isinstance(setpoints, dict) and any(key in setpoints for key in SETPOINT_KEYS):
+                self.controller.send_setpoints(**setpoints)
+            elif setpoints is not None:
+                self._send_positions(setpoints)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = e
+        self.cycle += 1
+
+    def _send_positions(self, positions):
+        # 위치만 돌려준 callback: 속도/토크 축에 위치 RPDO를 보내지 않도록 확인
+        non_position = self._non_position
+        if non_position and (not isinstance(positions, dict) or not non_position.isdisjoint(positions)):
+            raise ValueError(f"위치 모드가 아닌 축({sorted(non_position)})이 있으면 callback은 "
+                             f"{{'positions': ..., 'velocities': ..., 'torques': ...}}를 돌려줘야 합니다")
+        self.controller.set_positions(positions)
+
+    def get_stats(self):
+        """사이클 통계 (lateness 단위: s)"""
+        count = min(self.cycle, len(self._lateness))
+        samples = sorted(self._lateness[:count])
+        return {
+            'cycles': self.cycle,
+            'missed': self.missed,
+            'errors': self.errors,
+            'lateness_mean': sum(samples) / count if count else 0.0,
+            'lateness_p99': samples[min(count - 1, int(count * 0.99))] if count else 0.0,
+            'lateness_max': self.max_lateness,
+        }
@@ -0,0 +1,177 @@
+import threading
+from collections import deque
+
+import can
+
+STANDARD_MASK = 0x7FF
+EXTENDED_MASK = 0x1FFFFFFF
+
+
+class _Channel:
+    """같은 channel에 연결된 DirectBus 목록과 아직 전달하지 않은 프레임"""
+
+    def __init__(self):
+        self.buses = []
+        self.pending = deque()  # (보낸 버스, 메시지)
+        self.delivering = False  # 어떤 스레드가 pending을 비우는 중인지
+        self.lock = threading.Lock()
+
+
+class _ClockCyclicTask(can.broadcastmanager.ModifiableCyclicTaskABC):
+    """send_periodic을 가상 시계 타이머로 실행 (heartbeat 등이 가상 시간 주기로 나간다)"""
+
+    def __init__(self, bus, messages, period, duration=None, modifier_callback=None):
+        super().__init__(messages, period)
+        self.bus = bus
+        self.modifier_callback = modifier_callback
+        clock = bus.clock
+        self.end_time = clock.time() + duration if duration else None
+        self._index = 0
+        self._timer = clock.call_every(period, self._send, start=clock.time())
+
+    def _send(self):
+        if self.end_time is not None and self.bus.clock.time() > self.end_time:
+            self.stop()
+            return
+        msg = self.messages[self._index]
+        if self.modifier_callback is not None:
+            self.modifier_callback(msg)
+        self.bus.send(msg)
+        self._index = (self._index + 1) % len(self.messages)
+
+    def stop(self):
+        self._timer.cancel()
+
+
+class DirectBus(can.BusABC):
+    """가상 시계용 동기 CAN 버스
+
+    send()한 프레임을 수신 스레드 없이 보낸 스레드에서 바로 같은 channel의 다른 버스 리스너
+    (canopen MessageListener → Network.notify)에 전달한다. 전달 중 핸들러가 보낸 프레임(SDO 응답, SYNC에 대한 TPDO 등)은
+    큐에 쌓였다가 같은 루프에서 이어서 전달되므로 재귀 없이 send() 반환 시점에 응답까지 모두 처리되어 있다.
+    timestamp는 가상 시계 시각으로 찍는다.
+    """
+
+    _channels = {}
+    _channels_lock = threading.Lock()
+
+    def __init__(self, channel, clock, receive_own_messages=False, **kwargs):
+        """
+        :param channel: channel 이름 (같은 이름의 DirectBus끼리 연결)
+        :param clock: timestamp와 send_periodic 주기의 기준 (VirtualClock)
+        :param receive_own_messages: True면 내가 보낸 프레임도 내 리스너에 전달
+        """
+        self.channel_info = f'direct channel {channel!r}'
+        self.clock = clock
+        self.receive_own_messages = receive_own_messages
+        self.listeners = []  # DirectNotifier가 network.listeners로 교체
+        self._channel_name = channel
+        super().__init__(channel, **kwargs)
+        with DirectBus._channels_lock:
+            self._channel = DirectBus._channels.setdefault(channel, _Channel())
+            with self._channel.lock:
+                self._channel.buses.append(self)
+
+    def _apply_filters(self, filters):
+        # socketcan 커널 필터처럼 전달 전에 거른다. 정확히 일치하는 COB-ID 필터(update_filters가 만드는 대부분)는
+        # set 조회로, 나머지 mask 필터만 순서대로 비교 (BusABC._matches_filters는 필터 수만큼 매 프레임 순회)
+        self._exact_ids = (set(), set())  # (standard, extended) arbitration_id
+        self._mask_filters = []     # (can_id, can_mask, extended 또는 None)
+        for _filter in filters or ():
+            can_id, can_mask = _filter['can_id'], _filter['can_mask']
+            extended = _filter.get('extended')
+            if extended is False and can_mask & STANDARD_MASK == STANDARD_MASK:
+                self._exact_ids[0].add(can_id & STANDARD_MASK)
+            elif extended is True and can_mask & EXTENDED_MASK == EXTENDED_MASK:
+                self._exact_ids[1].add(can_id & EXTENDED_MASK)
+            else:
+                self._mask_filters.append((can_id, can_mask, extended))
+
+    def _accepts(self, msg):
+        """설치된 필터 중 하나라도 맞으면 True (필터가 없으면 모든 프레임)"""
+        if self._filters is None:
+            return True
+        if msg.arbitration_id in self._exact_ids[msg.is_extended_id]:
+            return True
+        for can_id, can_mask, extended in self._mask_filters:
+            if extended is not None and extended != msg.is_extended_id:
+                continue
+            if (can_id ^ msg.arbitration_id) & can_mask == 0:
+                return True
+        return False
+
+    def send(self, msg, timeout=None):
+        msg.timestamp = self.clock.time()
+        channel = self._channel
+        with channel.lock:
+            channel.pending.append((self, msg))
+            if channel.delivering:
+                # 이미 전달 중인 스레드(보통 핸들러를 호출한 바깥 send)가 이어서 전달
+                return
+            channel.delivering = True
+        try:
+            while True:
+                with channel.lock:
+                    if not channel.pending:
+                        channel.delivering = False
+                        return
+                    sender, msg = channel.pending.popleft()
+                    buses = tuple(channel.buses)
+                for bus in buses:
+                    if bus is sender and not bus.receive_own_messages:
+                        continue
+                    if bus._accepts(msg):
+                        for listener in bus.listeners:
+                            listener.on_message_received(msg)
+        except BaseException:
+            with channel.lock:
+                channel.pending.clear()
+                channel.delivering = False
+            raise
+
+    def _send_periodic_internal(self, msgs, period, duration=None, autostart=True, modifier_callback=None):
+        return _ClockCyclicTask(self, msgs, period, duration, modifier_callback)
+
+    def shutdown(self):
+        with DirectBus._channels_lock:
+            channel = self._channel
+            with channel.lock:
+                if self in channel.buses:
+                    channel.buses.remove(self)
+                if not channel.buses:
+                    DirectBus._channels.pop(self._channel_name, None)
+        super().shutdown()
+
+
+class DirectNotifier:
+    """DirectBus에 연결한 network의 notifier 자리 (수신 스레드 없음)
+
+    can.Notifier와 같은 add_listener/remove_listener/stop/exception을 제공하므로
+    프레임 캡처, 버스 사용량 집계처럼 network.notifier에 리스너를 붙이는 기능이 그대로 동작한다.
+    """
+
+    exception = None
+
+    def __init__(self, bus, listeners):
+        self.bus = bus
+        self.listeners = listeners
+        bus.listeners = listeners
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def stop(self, timeout=5):
+        for listener in self.listeners:
+            listener.stop()
+
+
+def connect_direct(network, channel, clock, receive_own_messages=False):
+    """canopen.Network.connect 대신 network를 DirectBus에 연결
+    :return: network
+    """
+    network.bus = DirectBus(channel, clock, receive_own_messages)
+    network.notifier = DirectNotifier(network.bus, network.listeners)
+    return network
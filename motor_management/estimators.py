@@ -0,0 +1,134 @@
+class FiniteDifferenceEstimator:
+    """연속한 두 속도 샘플의 차분을 실제 수신 시각 간격으로 나눈 가속도 (기본 추정기)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._velocity = None
+        self._timestamp = 0.0
+        self.acceleration = 0.0
+
+    def update(self, velocity, timestamp, nominal_dt):
+        """
+        :param velocity: 측정 속도
+        :param timestamp: 수신 시각[s] (CAN 메시지 timestamp)
+        :param nominal_dt: 수신 시각을 쓸 수 없을 때(간격 0 이하) 사용할 SYNC 주기[s]
+        :return: 추정 가속도
+        """
+        if self._velocity is not None:
+            dt = timestamp - self._timestamp
+            if dt <= 0:
+                dt = nominal_dt
+            self.acceleration = (velocity - self._velocity) / dt
+        self._velocity = velocity
+        self._timestamp = timestamp
+        return self.acceleration
+
+
+class AlphaBetaEstimator:
+    """alpha-beta 필터로 속도/가속도를 함께 추정 (수신 시각 간격으로 예측)
+    alpha가 클수록 측정 속도를 빨리 따라가고, beta가 클수록 가속도가 빨리 변한다.
+    """
+
+    def __init__(self, alpha=0.5, beta=0.1):
+        self.alpha = alpha
+        self.beta = beta
+        self.reset()
+
+    def reset(self):
+        self.velocity = None   # 필터링된 속도
+        self.acceleration = 0.0
+        self._timestamp = 0.0
+
+    def update(self, velocity, timestamp, nominal_dt):
+        if self.velocity is None:
+            self.velocity = velocity
+            self._timestamp = timestamp
+            return self.acceleration
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            dt = nominal_dt
+        predicted = self.velocity + self.acceleration * dt
+        residual = velocity - predicted
+        self.velocity = predicted + self.alpha * residual
+        self.acceleration += self.beta * residual / dt
+        self._timestamp = timestamp
+        return self.acceleration
+
+
+class PolyFitEstimator:
+    """최근 window개 샘플에 1차 또는 2차 다항식을 최소자승으로 맞추고,
+    마지막 샘플 시각에서의 미분값을 가속도로 사용 (정규방정식 closed form, numpy 호출 없음)
+    """
+
+    def __init__(self, window=8, order=2):
+        if order not in (1, 2):
+            raise ValueError(f"지원하지 않는 다항식 차수입니다: {order}")
+        if window <= order:
+            raise ValueError(f"window({window})는 order({order})보다 커야 합니다")
+        self.window = window
+        self.order = order
+        self.reset()
+
+    def reset(self):
+        self._times = [0.0] * self.window
+        self._values = [0.0] * self.window
+        self._count = 0
+        self._last_timestamp = 0.0
+        self.acceleration = 0.0
+
+    def update(self, velocity, timestamp, nominal_dt):
+        # 수신 시각을 쓸 수 없으면 이전 샘플 + SYNC 주기로 대신한다
+        if self._count and timestamp - self._last_timestamp <= 0:
+            timestamp = self._last_timestamp + nominal_dt
+        index = self._count % self.window
+        self._times[index] = timestamp
+        self._values[index] = velocity
+        self._count += 1
+        self._last_timestamp = timestamp
+        if self._count <= self.order:
+            return self.acceleration
+
+        # 큰 절대 시각에서의 정밀도 손실을 피하도록 마지막 샘플 기준 상대 시각(x)으로 계산
+        count = min(self._count, self.window)
+        s1 = s2 = s3 = s4 = t0 = t1 = t2 = 0.0
+        for t, y in zip(self._times[:count], self._values[:count]):
+            x = t - timestamp
+            x2 = x * x
+            s1 += x
+            s2 += x2
+            t0 += y
+            t1 += x * y
+            if self.order == 2:
+                s3 += x2 * x
+                s4 += x2 * x2
+                t2 += x2 * y
+        if self.order == 1:
+            det = count * s2 - s1 * s1
+            if det:
+                self.acceleration = (count * t1 - s1 * t0) / det
+            return self.acceleration
+        # y = c2 x^2 + c1 x + c0, x = 0에서의 미분 = c1 (Cramer 공식)
+        det = s4 * (s2 * count - s1 * s1) - s3 * (s3 * count - s1 * s2) + s2 * (s3 * s1 - s2 * s2)
+        if det:
+            self.acceleration = (s4 * (t1 * count - s1 * t0) - t2 * (s3 * count - s1 * s2)
+                                 + s2 * (s3 * t0 - t1 * s2)) / det
+        return self.acceleration
+
+
+# set_estimator에서 이름으로 고를 수 있는 추정기
+ESTIMATORS = {
+    'finite_difference': FiniteDifferenceEstimator,
+    'alpha_beta': AlphaBetaEstimator,
+    'polyfit': PolyFitEstimator,
+}
+
+
+def create_estimator(estimator, **kwargs):
+    """이름('finite_difference', 'alpha_beta', 'polyfit') 또는 클래스로 추정기 생성"""
+    if isinstance(estimator, str):
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"지원하지 않는 추정기입니다: {estimator}")
+        estimator = ESTIMATORS[estimator]
+    return estimator(**kwargs)
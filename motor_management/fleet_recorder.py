@@ -0,0 +1,72 @@
+import numpy as np
+
+from .binary_log import BinaryLogWriter
+from .clock import system_clock
+from .ring_logger import RingBufferLogger
+
+
+class FleetRecorder:
+    """SYNC 사이클 스냅샷마다 모든 축의 값을 레코드 하나로 기록하는 기록기.
+
+    레코드: cycle, timestamp(사이클 첫 TPDO 수신 시각), complete, 그리고 FleetState.SIGNALS 순서로
+    축별 값(목표값, 실제 위치/속도/토크, statusword, TPDO 수신 시각)이 이어진다.
+    파일은 binary_log 형식이며, 한 번의 실행(start ~ stop)이 파일 하나가 된다.
+    """
+    UNITS = {
+        'position': 'rad',
+        'velocity': 'rad/s',
+        'torque': 'Nm',
+        'acceleration': 'rad/s^2',
+        'statusword': '',
+        'target_position': 'pulse',
+        'target_velocity': 'rad/s',
+        'target_torque': '1/1000 rated',
+        'rx_time': 's',
+    }
+
+    def __init__(self, state, filename, capacity=16384, flush_interval=0.1, sample_period=None,
+                 clock=system_clock):
+        """
+        :param state: 기록할 FleetState (기록 시작 시점에 등록된 축만 기록)
+        :param filename: 기록 파일 경로
+        :param capacity: 버퍼에 담을 최대 레코드 수 (가득 차면 새 레코드는 버림)
+        :param flush_interval: 파일 기록 주기[s]
+        :param sample_period: 헤더에 저장할 SYNC 주기[s]
+        :param clock: 헤더의 시작 시각 기준 (스냅샷 timestamp와 같은 시계)
+        """
+        self.state = state
+        self.clock = clock
+        self.filename = filename
+        self.node_ids = list(state.node_ids)
+        self._count = len(self.node_ids)
+
+        columns = ['cycle', 'timestamp', 'complete']
+        units = ['', 's', '']
+        axes = [None, None, None]
+        for signal in state.SIGNALS:
+            columns += [signal] * self._count
+            units += [self.UNITS.get(signal, '')] * self._count
+            axes += self.node_ids
+        writer = BinaryLogWriter(filename, columns, units, axes, sample_period,
+                                 {'signals': list(state.SIGNALS)})
+        self.logger = RingBufferLogger(writer, len(columns), capacity, flush_interval, time_column=False)
+
+    def start(self):
+        self.logger.start(self.clock.time())
+        self.state.add_snapshot_listener(self._on_snapshot)
+
+    def stop(self):
+        """수신 중단 후 남은 레코드를 모두 기록하고 파일 닫기"""
+        self.state.remove_snapshot_listener(self._on_snapshot)
+        self.logger.stop()
+
+    def _on_snapshot(self, snapshot):
+        # 수신 스레드: 레코드 한 줄을 만들어 버퍼에 넣기만 한다
+        count = self._count
+        parts = [(snapshot.cycle, snapshot.timestamp, snapshot.complete)]
+        for array in snapshot[4:]:
+            parts.append(array[:count])
+        self.logger.push_row(np.concatenate(parts))
+
+    def get_stats(self):
+        return self.logger.get_stats()
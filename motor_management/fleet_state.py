@@ -0,0 +1,160 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+class FleetState:
+    """모든 축의 피드백을 신호별 배열(structure-of-arrays)로 보관하는 저장소.
+
+    축마다 고정 slot이 배정되고, TPDO 디코더는 각 배열의 slot 위치에 바로 쓴다.
+    CANopen 노드는 최대 127개이므로 용량을 미리 잡아두어 배열이 재할당되지 않는다.
+    (디코더가 배열 참조를 캐시해도 안전)
+    """
+    MAX_AXES = 127
+    SIGNALS = ('position', 'velocity', 'torque', 'acceleration', 'statusword',
+               'target_position', 'target_velocity', 'target_torque', 'rx_time')
+    # 축별 설정값 (bind_state로 저장소를 옮길 때 함께 복사)
+    AXIS_ARRAYS = SIGNALS + ('zero_offset', 'position_scale')
+    RX_BITS = 4  # 축당 사이클마다 받을 수 있는 TPDO 수 (received 비트마스크 폭)
+
+    def __init__(self, capacity=MAX_AXES):
+        self.capacity = capacity
+        self.position = np.zeros(capacity)      # 현재 위치 [rad]
+        self.velocity = np.zeros(capacity)      # 현재 속도 [rad/s]
+        self.torque = np.zeros(capacity)        # 현재 토크 센서 값 [Nm]
+        self.acceleration = np.zeros(capacity)  # 현재 가속도 [rad/s^2]
+        self.statusword = np.zeros(capacity, dtype=np.uint16)
+        self.target_position = np.zeros(capacity)  # 목표 위치 (zero offset 포함, 드라이브 단위)
+        self.target_velocity = np.zeros(capacity)  # 목표 속도
+        self.target_torque = np.zeros(capacity)    # 목표 토크 (드라이브 단위)
+        self.rx_time = np.zeros(capacity)          # 마지막 TPDO 수신 시각[s] (CAN 메시지 timestamp)
+        self.rx_count = np.zeros(capacity, dtype=np.int64)     # 받은 TPDO 누적 수
+        self.rx_expected = np.zeros(capacity, dtype=np.int64)  # 사이클마다 받아야 하는 TPDO 수
+        self.zero_offset = np.zeros(capacity)      # 영점 오프셋 (드라이브 단위)
+        self.position_scale = np.ones(capacity)    # 위치 1 단위당 rad
+        self.node_ids = []  # slot → node_id
+        self.slots = {}     # node_id → slot
+
+        # SYNC 사이클 스냅샷: 수신 스레드만 아래 값을 갱신하고, 완성된 사이클은 snapshot 참조 교체로 발행
+        # (SYNC를 보내는 쪽은 on_sync로 sync_count만 올려 사이클 경계를 알린다)
+        self.snapshot_timeout = 0.005  # 사이클 첫 TPDO 이후 이 시간[s]이 지나면 미완성이라도 발행
+        self.cycle = 0          # 발행한 스냅샷 수
+        self.incomplete = 0     # 타임아웃/중복 수신으로 미완성 상태로 발행한 스냅샷 수
+        self.snapshot = None    # 마지막으로 발행한 Snapshot
+        self._expected = 0      # 사이클마다 받아야 하는 TPDO 비트 (slot * RX_BITS + TPDO 순번)
+        self._received = 0      # 현재 사이클에서 받은 TPDO 비트
+        self._cycle_start = 0.0
+        self._cycle_sync = 0    # 현재 사이클을 연 시점의 sync_count
+        # SYNC 수 (setpoint 지연 측정에서 피드백이 setpoint를 보낸 사이클 이후의 SYNC에 대한 것인지 구분)
+        self.sync_count = 0
+        self.sync_time = 0.0       # 마지막 SYNC 시각[s]
+        self.external_sync = True  # 컨트롤러가 SYNC를 보내지 않으면(on_sync 미호출) 사이클 첫 TPDO 수신을 SYNC로 센다
+        self._node_ids = ()
+        self._snapshot_listeners = ()  # 발행 시 수신 스레드에서 호출할 함수 (교체로만 갱신)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def add_axis(self, node_id):
+        """축을 등록하고 slot 번호 반환 (이미 등록된 축이면 기존 slot)"""
+        if node_id in self.slots:
+            return self.slots[node_id]
+        if len(self.node_ids) >= self.capacity:
+            raise ValueError(f"FleetState 용량({self.capacity}) 초과")
+        slot = len(self.node_ids)
+        self.node_ids.append(node_id)
+        self.slots[node_id] = slot
+        self._node_ids = tuple(self.node_ids)
+        return slot
+
+    def copy_axis(self, source, source_slot, slot):
+        """다른 저장소의 축 값을 이 저장소의 slot으로 복사"""
+        for name in self.AXIS_ARRAYS:
+            getattr(self, name)[slot] = getattr(source, name)[source_slot]
+
+    def rx_bit(self, slot, index):
+        """사이클마다 받아야 하는 TPDO로 등록하고 rx_begin/rx_end에 넘길 비트 반환
+        :param index: 축 안에서의 TPDO 순번 (0 ~ RX_BITS-1)
+        """
+        if not 0 <= index < self.RX_BITS:
+            raise ValueError(f"TPDO 순번은 0 ~ {self.RX_BITS - 1} 이어야 합니다: {index}")
+        bit = 1 << (slot * self.RX_BITS + index)
+        if not self._expected & bit:
+            self._expected |= bit
+            self.rx_expected[slot] += 1
+        return bit
+
+    def rx_begin(self, bit, timestamp):
+        """수신 스레드에서 TPDO 값을 배열에 쓰기 전에 호출
+        같은 TPDO가 다시 왔거나, 그 사이 컨트롤러가 다음 SYNC를 보냈거나(on_sync), 사이클 첫 TPDO 이후
+        타임아웃이 지났으면 이전 사이클을 미완성으로 발행한다. 발행은 수신 스레드에서만 하므로 잠금이 필요 없다.
+        TPDO가 빠진 사이클은 다음 TPDO가 올 때 발행된다.
+        """
+        received = self._received
+        if received and (received & bit or self.sync_count != self._cycle_sync
+                         or timestamp - self._cycle_start > self.snapshot_timeout):
+            self._received = received = 0
+            self._publish(False)
+        if not received:
+            if self.external_sync:
+                self.sync_time = timestamp
+                self.sync_count += 1
+            self._cycle_start = timestamp
+            self._cycle_sync = self.sync_count
+
+    def rx_end(self, bit):
+        """수신 스레드에서 TPDO 값을 배열에 쓴 뒤 호출 (등록된 TPDO가 모두 모이면 사이클 발행)"""
+        received = self._received | bit
+        if received & self._expected == self._expected:
+            self._received = 0
+            self._publish(True)
+        else:
+            self._received = received
+
+    def on_sync(self, timestamp):
+        """컨트롤러가 SYNC를 보내기 직전에 호출: SYNC 수를 세어 사이클 경계만 표시한다.
+        배열은 수신 스레드가 쓰는 중일 수 있으므로 여기서 발행하지 않고, 수신 스레드가 다음 rx_begin에서 발행한다.
+        """
+        self.external_sync = False
+        self.sync_time = timestamp
+        self.sync_count += 1
+
+    def add_snapshot_listener(self, listener):
+        """스냅샷이 발행될 때마다 수신 스레드에서 listener(snapshot) 호출 (빨리 반환해야 함)"""
+        self._snapshot_listeners += (listener,)
+
+    def remove_snapshot_listener(self, listener):
+        self._snapshot_listeners = tuple(l for l in self._snapshot_listeners if l != listener)
+
+    def _publish(self, complete):
+        count = len(self._node_ids)
+        arrays = []
+        for name in self.SIGNALS:
+            array = getattr(self, name)[:count].copy()
+            array.flags.writeable = False
+            arrays.append(array)
+        if not complete:
+            self.incomplete += 1
+        self.cycle += 1
+        # 참조 교체 한 번으로 발행하므로 읽는 쪽은 잠금 없이 항상 한 사이클 전체를 본다
+        snapshot = Snapshot(self.cycle, self._cycle_start, complete, self._node_ids, *arrays)
+        self.snapshot = snapshot
+        for listener in self._snapshot_listeners:
+            listener(snapshot)
+
+    def get(self, signal, copy=False):
+        """등록된 축 수만큼의 신호 배열 반환
+        :param signal: SIGNALS 중 하나
+        :param copy: False면 읽기 전용 view, True면 복사본
+        """
+        array = getattr(self, signal)[:len(self.node_ids)]
+        if copy:
+            return array.copy()
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+
+# 한 SYNC 사이클의 모든 축 피드백/목표값 (배열은 읽기 전용 복사본, 축 순서는 node_ids)
+#   cycle: 스냅샷 번호, timestamp: 사이클 첫 TPDO 수신 시각, complete: 모든 TPDO 수신 여부
+Snapshot = namedtuple('Snapshot', ('cycle', 'timestamp', 'complete', 'node_ids') + FleetState.SIGNALS)
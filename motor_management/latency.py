@@ -0,0 +1,120 @@
+class LatencyHistogram:
+    """고정 폭 bin 히스토그램 (기록은 리스트 인덱스 증가 한 번, 백분위는 조회 시 계산)"""
+
+    def __init__(self, bin_width=0.0001, max_latency=0.1):
+        """
+        :param bin_width: bin 폭[s]
+        :param max_latency: 히스토그램 범위[s] (넘는 값은 마지막 bin에 모음, min/max는 정확히 유지)
+        """
+        self.bin_width = bin_width
+        self.bins = int(round(max_latency / bin_width)) + 1
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * self.bins
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, value):
+        index = int(value / self.bin_width)
+        if index >= self.bins:
+            index = self.bins - 1
+        elif index < 0:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """q(0~100) 백분위 값 (해당 bin의 위쪽 경계, 최대값을 넘지 않음)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                return min((index + 1) * self.bin_width, self.max)
+        return self.max
+
+
+class LatencyTracker:
+    """한 축의 setpoint 전송 → drive 피드백 반영까지의 지연 측정.
+
+    setpoint를 보낼 때 전송 시각과 SYNC 번호를 기록해두고, 응답으로 볼 수 있는 첫 TPDO1까지의 시간을 기록한다.
+    응답 기준(response):
+    - 'sync': 전송한 사이클 이후의 SYNC에 대한 TPDO1 (cyclic 모드의 동기 RPDO, 즉시 적용 RPDO)
+              전송 직후 도착하는 같은 사이클의 TPDO1은 이전 목표값을 반영한 것이므로 응답으로 보지 않는다.
+    - 'ack': set-point acknowledge(Statusword bit 12)의 상승 엣지만 (profile position STREAMING)
+    - 'any': ack 엣지 또는 'sync' 기준 중 먼저 온 것 (profile position HANDSHAKE, 0x2F/0x3F가 TPDO 사이에
+             연달아 가므로 ack 엣지가 TPDO1에 보이지 않는 경우가 많다)
+    응답 전에 다시 보낸 setpoint는 새로 기록하지 않고 superseded만 센다. (가장 먼저 보낸 setpoint 기준)
+    """
+    SETPOINT_ACK = 0x1000
+
+    def __init__(self, bin_width=0.0001, max_latency=0.1, sync_period=None):
+        """
+        :param bin_width: 히스토그램 bin 폭[s]
+        :param max_latency: 히스토그램 범위[s]
+        :param sync_period: SYNC 주기[s] (주면 SYNC 기준 응답이 전송 사이클의 SYNC로부터
+                            한 주기 이상 지난 피드백인지 검사해 early로 센다)
+        """
+        self.histogram = LatencyHistogram(bin_width, max_latency)
+        self.sync_period = sync_period
+        self.cycle_counts = {}   # {응답까지 걸린 SYNC 수: 횟수}
+        self.superseded = 0      # 응답 전에 다시 보내서 측정하지 않은 setpoint 수
+        self.early = 0           # 전송 사이클의 SYNC로부터 한 주기가 지나기 전에 응답으로 처리된 수 (0이어야 정상)
+        self._pending = None     # (전송 시각, SYNC 번호, 그 SYNC 시각, 응답 기준)
+        self._statusword = 0
+
+    def on_send(self, timestamp, sync_count, sync_time, response='sync'):
+        """setpoint 전송 직후 호출
+        :param sync_count: 전송 시점까지의 SYNC 수 (FleetState.sync_count)
+        :param sync_time: 마지막 SYNC 시각[s] (FleetState.sync_time)
+        :param response: 응답 기준 ('sync', 'ack', 'any')
+        """
+        if self._pending is None:
+            self._pending = (timestamp, sync_count, sync_time, response)
+        else:
+            self.superseded += 1
+
+    def on_feedback(self, timestamp, sync_count, statusword):
+        """TPDO1 수신 시 호출 (수신 스레드)"""
+        pending = self._pending
+        if pending is not None:
+            sent_time, sent_count, sent_sync_time, response = pending
+            acked = (response != 'sync' and statusword & self.SETPOINT_ACK
+                     and not self._statusword & self.SETPOINT_ACK)
+            # 전송 전에 수신된(처리만 늦은) 프레임은 응답이 될 수 없다
+            synced = response != 'ack' and sync_count > sent_count and timestamp > sent_time
+            if acked or synced:
+                self._pending = None
+                self.histogram.add(timestamp - sent_time)
+                cycles = sync_count - sent_count
+                self.cycle_counts[cycles] = self.cycle_counts.get(cycles, 0) + 1
+                # SYNC 기준 응답은 전송 사이클의 SYNC로부터 한 주기 뒤의 피드백이어야 한다
+                # (SYNC 지터를 고려해 반 주기 미만일 때만 잘못된 사이클의 피드백으로 본다)
+                if not acked and self.sync_period and timestamp - sent_sync_time < self.sync_period / 2:
+                    self.early += 1
+        self._statusword = statusword
+
+    def get_stats(self):
+        """지연 통계 (단위: s)"""
+        histogram = self.histogram
+        return {
+            'count': histogram.count,
+            'superseded': self.superseded,
+            'early': self.early,
+            'mean': histogram.total / histogram.count if histogram.count else 0.0,
+            'min': histogram.min if histogram.min is not None else 0.0,
+            'p50': histogram.percentile(50),
+            'p99': histogram.percentile(99),
+            'max': histogram.max,
+            'cycles': dict(sorted(self.cycle_counts.items())),
+        }
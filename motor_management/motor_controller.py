@@ -1,32 +1,104 @@
+import can
 import canopen
-import time
+from datetime import datetime
+import numpy as np
 from .abstract_motor import AbstractMotor
+from .bringup import run_per_node, BringUpError
+from .bootup_watcher import BootupWatcher
+from .od_cache import default_od_cache
+from .cycle_executor import CycleExecutor
+from .fleet_state import FleetState
+from .fleet_recorder import FleetRecorder
+from .sync_monitor import SyncMonitor
+from .bus_load import BusLoadMonitor
+from .replay import LogReplayer
+from .clock import system_clock
+from .can_filters import build_filters, subscribed_cob_ids
+from .direct_bus import connect_direct
 
 class MotorController:
     """
     하나의 CAN Bus 상에서 여러 모터(Node)를 관리하는 컨트롤러.
     예시: USB-CAN 장치와 연결하고, 제조사별 Motor 객체 등록/호출 등.
     """
-    def __init__(self, channel='can0', bustype='socketcan', bitrate=1000000, interface=None):
+    def __init__(self, channel='can0', bustype='socketcan', bitrate=1000000, interface=None, od_cache=default_od_cache,
+                 receive_own_messages=False, connect=True, clock=system_clock, can_filters=True):
         """
         :param channel: 예) 'can0', 'pcan0', 'usb0' 또는 'COM3' 등
         :param bustype: canopen 또는 python-can에서 사용하는 bustype 설정
         :param bitrate: CAN Bus 속도
         :param interface: slcan 등의 인터페이스 타입. 설정 시 bustype 대신 사용됨
+        :param od_cache: EDS 파싱 결과 캐시(ODCache). None이면 모터마다 EDS를 새로 파싱
+        :param receive_own_messages: True면 내가 보낸 프레임도 수신 (SYNC 모니터, 캡처에 필요)
+        :param connect: False면 버스에 연결하지 않음 (replay로 기록된 로그만 처리할 때)
+        :param clock: 대기/시각 기준 (SystemClock 또는 VirtualClock). 등록된 모터와 SYNC, 사이클 실행기가 함께 사용
+                      VirtualClock에 interface='virtual'이면 수신 스레드 없이 프레임을 동기 전달 (direct_bus 참고)
+        :param can_filters: True면 구독 중인 COB-ID만 받도록 버스 필터 설정 (update_filters 참고)
         """
+        self.od_cache = od_cache
+        self.clock = clock
+        self.bitrate = bitrate
+        self.receive_own_messages = receive_own_messages
         self.network = canopen.Network()
-        if interface is None:
-            self.network.connect(channel=channel, bustype=bustype, bitrate=bitrate)
-        else:
-            self.network.connect(interface=interface, channel=channel, bitrate=bitrate)
+        if connect:
+            if interface == 'virtual' and not clock.realtime:
+                # 가상 시계: 수신 스레드 없이 시계를 진행하는 스레드에서 프레임을 바로 전달
+                connect_direct(self.network, channel, clock, receive_own_messages)
+            elif interface is None:
+                self.network.connect(channel=channel, bustype=bustype, bitrate=bitrate,
+                                     receive_own_messages=receive_own_messages)
+            else:
+                self.network.connect(interface=interface, channel=channel, bitrate=bitrate,
+                                     receive_own_messages=receive_own_messages)
         # 등록된 모터 리스트/딕셔너리
         self.motors = {}
+        # slot 순서의 모터 리스트 (일괄 setpoint 전송 순서)
+        self.axis_motors = []
+        # 모든 축의 피드백 배열 (축 순서는 self.state.node_ids)
+        self.state = FleetState()
+        # 마지막으로 실행된 초기화 단계별 리포트 {'init': BringUpReport, ...}
+        self.bringup_reports = {}
+        # 마지막 reset_all에서 boot-up을 보내지 않은 노드 목록
+        self.missing_nodes = []
+        # 마지막 pdo_mapping_all에서 이미 원하는 매핑을 가지고 있던 노드 목록
+        self.preconfigured_nodes = []
+        # cycle_start로 실행 중인 사이클 실행기
+        self.cycle_executor = None
+        # record_start로 실행 중인 사이클 기록기
+        self.recorder = None
+        # 현재 SYNC 주기[s] (sync_start / cycle_start에서 설정)
+        self.sync_period = None
+        # 가상 시계에서 sync_start로 등록한 주기 SYNC 타이머
+        self._sync_timer = None
+        # sync_monitor_start로 실행 중인 SYNC 모니터
+        self.sync_monitor = None
+        # bus_load_start로 실행 중인 버스 사용량 집계기
+        self.bus_load = None
+        # capture_start로 실행 중인 프레임 기록기 (can.Logger)
+        self.capture = None
+        # replay로 실행한 로그 재생기
+        self.replayer = None
+        # 구독 COB-ID 기반 수신 필터 사용 여부와 현재 설치된 필터
+        self.can_filters = can_filters
+        self.filters = None
+        self.update_filters()
 
     def add_motor(self, motor: AbstractMotor):
         """MotorController가 관리할 모터를 추가한다."""
-        node = self.network.add_node(motor.node_id, motor.eds_path)
+        if self.od_cache is not None:
+            object_dictionary = self.od_cache.load(motor.eds_path, motor.node_id)
+        else:
+            object_dictionary = motor.eds_path
+        node = self.network.add_node(motor.node_id, object_dictionary)
         motor.node = node
         motor.network = self.network
+        motor.clock = self.clock
+        slot = self.state.add_axis(motor.node_id)
+        motor.bind_state(self.state, slot)
+        if slot < len(self.axis_motors):
+            self.axis_motors[slot] = motor
+        else:
+            self.axis_motors.append(motor)
         # SDO 타임아웃 값 설정
         node.sdo.RESPONSE_TIMEOUT = 2.0  # 2초로 변경
         # 재시도 횟수 설정
@@ -34,18 +106,23 @@ class MotorController:
         # 요청 전 대기 시간 설정
         # node.sdo.PAUSE_BEFORE_SEND = 5
         self.motors[motor.node_id] = motor
+        self.update_filters()
 
-    def all_motors_init_start(self, interval=0.01):
+    def all_motors_init_start(self, interval=0.01, parallel=False, max_workers=None, bootup_timeout=5.0):
             # 리셋
-        self.reset_all()
+        self.reset_all(parallel=parallel, max_workers=max_workers, bootup_timeout=bootup_timeout)
         #time.sleep(3) 
+
+        # cyclic 모드는 init에서 SYNC 주기를 drive에 기록하므로 먼저 설정
+        for node_id, motor in self.motors.items():
+            motor.set_dt(interval)
         
         # 모터 전체 초기화
-        self.init_all()
+        self.init_all(parallel=parallel, max_workers=max_workers)
         #time.sleep(3) 
         
         # PDO 매핑
-        self.pdo_mapping_all()
+        self.pdo_mapping_all(parallel=parallel, max_workers=max_workers)
 
         # Switch On
         self.set_switchOn_all()
@@ -56,25 +133,56 @@ class MotorController:
         # 동기화 시작
         self.sync_start(interval)
 
-    def init_all(self):
+    def _run_all(self, step, parallel=False, max_workers=None, **kwargs):
+        """모든 모터에 대해 step을 실행하고, 실패한 노드가 있으면 BringUpError 발생
+        :param parallel: True면 노드별 SDO 시퀀스를 동시에 실행 (소요 시간 = 가장 느린 노드)
+        :param max_workers: 동시 실행 노드 수 제한 (None이면 제한 없음)
+        :param kwargs: 모터 메서드에 전달할 인자
+        """
+        report = run_per_node(self.motors, step, parallel, max_workers, **kwargs)
+        self.bringup_reports[step] = report
+        if parallel:
+            report.print_summary()
+        if not report.ok:
+            if not parallel:
+                report.print_summary()
+            raise BringUpError(report) from report.results[report.failed[0]].error
+        return report
+
+    def init_all(self, parallel=False, max_workers=None):
         """등록된 모든 모터를 초기화"""
-        for node_id, motor in self.motors.items():
-            motor.init()
+        return self._run_all('init', parallel, max_workers)
 
-    def reset_all(self):
-        """등록된 모든 모터를 리셋"""
-        for node_id, motor in self.motors.items():
-            motor.reset()            
+    def reset_all(self, parallel=False, max_workers=None, bootup_timeout=5.0, stop_delay=0.05):
+        """등록된 모든 모터를 리셋
+        NMT Reset 후 고정 대기 대신 모든 노드의 boot-up(0x700+id)을 기다린다.
+        :param bootup_timeout: boot-up 대기 최대 시간[s]
+        :param stop_delay: NMT Stop 후 Reset 전 대기 시간[s]
+        """
+        report = self._run_all('reset', parallel, max_workers)
 
         self.network.nmt.send_command(0x02)  # Stop
-        time.sleep(0.5)
-        self.network.nmt.send_command(0x82)  # Reset
-        time.sleep(1)  # 재설정 후 충분한 대기 시간
+        self.clock.sleep(stop_delay)
+        with BootupWatcher(self.network, self.motors) as watcher:
+            self.network.nmt.send_command(0x82)  # Reset
+            self.missing_nodes = watcher.wait(bootup_timeout)
 
-    def pdo_mapping_all(self):
-        """등록된 모든 모터에 대해 PDO 매핑 설정"""
-        for node_id, motor in self.motors.items():
-            motor.pdo_mapping()
+        if self.missing_nodes:
+            print(f"[reset_all] {bootup_timeout}s 내에 boot-up이 수신되지 않은 노드: {self.missing_nodes}")
+        else:
+            print(f"[reset_all] 모든 노드 boot-up 완료: {max(watcher.bootup_times.values(), default=0) * 1000:.1f} ms")
+        return report
+
+    def pdo_mapping_all(self, parallel=False, max_workers=None, verify=True):
+        """등록된 모든 모터에 대해 PDO 매핑 설정
+        :param verify: True면 드라이브의 현재 매핑을 읽어 다른 PDO만 다시 쓴다
+        """
+        report = self._run_all('pdo_mapping', parallel, max_workers, verify=verify)
+        # None을 반환한 모터는 매핑을 확인하지 않은 것이므로 제외 (실패한 노드도 제외)
+        self.preconfigured_nodes = [node_id for node_id, result in report.results.items()
+                                    if result.ok and result.value is not None and not result.value]
+        if self.preconfigured_nodes:
+            print(f"PDO 매핑이 이미 설정되어 있던 노드: {self.preconfigured_nodes}")
 
         # Start remote node
         try:
@@ -82,6 +190,13 @@ class MotorController:
             print('원격 노드 시작 명령을 전송했습니다.')
         except canopen.SdoCommunicationError as e:
             print(f'원격 노드 시작 중 오류 발생: {str(e)}')
+        return report
+
+    def pdo_mapping_local_all(self):
+        """드라이브와 통신하지 않고 모든 모터의 PDO 구성을 로컬에만 적용 (replay 등 버스 없이 실행할 때)"""
+        for node_id, motor in self.motors.items():
+            if hasattr(motor, 'pdo_mapping_local'):
+                motor.pdo_mapping_local()
 
     def set_switchOn_all(self):
         for node_id, motor in self.motors.items():
@@ -90,18 +205,281 @@ class MotorController:
     def pdo_callback_register_all(self):
         for node_id, motor in self.motors.items():
             motor.pdo_callback_register()
+        self.update_filters()
+
+    def update_filters(self):
+        """network에 구독된 COB-ID(TPDO, SDO 응답, EMCY, heartbeat, SYNC 모니터 등)만 받도록 버스 필터 설정
+        socketcan은 커널 필터로 설치되어 다른 노드의 RPDO, 다른 마스터의 SDO 등은 Python으로 올라오지 않는다.
+        (커널 필터를 지원하지 않는 인터페이스는 python-can이 수신 후 걸러낸다)
+        모터 추가, 콜백 등록 시 자동으로 호출되며, network.subscribe를 직접 호출했다면 이 함수를 다시 호출한다.
+        캡처나 버스 사용량 집계 중에는 모든 프레임을 받는다.
+        """
+        bus = self.network.bus
+        if bus is None:
+            return
+        if self.can_filters and self.capture is None and self.bus_load is None:
+            filters = build_filters(subscribed_cob_ids(self.network))
+        else:
+            filters = None
+        if filters == self.filters:
+            return
+        self.filters = filters
+        bus.set_filters(filters)
 
     def sync_start(self, interval=0.01):
-        self.network.sync.start(interval) # 10ms
+        self.sync_stop()
+        self.sync_period = interval
+        self.state.snapshot_timeout = interval / 2
+        if self.clock.realtime:
+            self.network.sync.start(interval) # 10ms
+            # canopen이 보내는 SYNC는 컨트롤러가 셀 수 없으므로 사이클 첫 TPDO 수신으로 센다
+            self.state.external_sync = True
+        else:
+            # 가상 시계: 시계가 진행될 때(clock.sleep/advance) 주기마다 SYNC 전송
+            self._sync_timer = self.clock.call_every(interval, self.send_sync)
         for node_id, motor in self.motors.items():
             motor.set_dt(interval)
-        
+
+    def sync_stop(self):
+        """주기 SYNC 전송 중지"""
+        self.network.sync.stop()
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+    def send_sync(self, counter=None):
+        """SYNC 한 프레임 전송
+        가상 시계('virtual' 인터페이스)에서는 반환 시점에 이 사이클의 TPDO가 모두 처리되어 스냅샷이 발행되어 있다.
+        :param counter: SYNC counter 바이트 (None이면 counter 없음)
+        """
+        # SYNC 수를 세어 사이클 경계를 표시 (이전 사이클이 미완성이면 수신 스레드가 다음 TPDO에서 발행)
+        self.state.on_sync(self.clock.time())
+        self.network.sync.transmit(counter)
+
+    def send_setpoints(self, positions=None, velocities=None, torques=None):
+        """축별 setpoint를 한 번씩 전송
+        :param positions: {node_id: 위치} 딕셔너리 또는 축 순서 배열 (CSP 축, set_positions 참고)
+        :param velocities: {node_id: 속도[rad/s]} 딕셔너리 (CSV 축)
+        :param torques: {node_id: 토크} 딕셔너리 또는 축 순서 배열 (CST 축, set_torques 참고)
+        """
+        if positions is not None:
+            self.set_positions(positions)
+        if velocities is not None:
+            motors = self.motors
+            for node_id, value in velocities.items():
+                motors[node_id].set_velocity(value)
+        if torques is not None:
+            self.set_torques(torques)
+
+    def sync_cycle(self, positions=None, velocities=None, torques=None):
+        """SYNC 한 사이클 실행: 각 축의 setpoint를 한 번씩 보낸 뒤 SYNC를 한 번 전송한다.
+        sync_start()의 주기 SYNC 대신 호스트가 사이클 타이밍을 직접 정할 때 사용한다.
+        cyclic 모드(RPDO 전송 타입 1)에서는 이 SYNC에서 모든 축이 동시에 새 목표값을 적용한다.
+        """
+        self.send_setpoints(positions, velocities, torques)
+        self.send_sync()
+
+    def cycle_start(self, period, callback, phase_offset=0.0, **kwargs):
+        """컨트롤러가 SYNC와 setpoint 전송 타이밍을 직접 관리하는 실시간 사이클 시작
+        매 주기 SYNC를 보내고, phase_offset 후 callback(cycle, controller)를 실행해
+        반환된 setpoint를 send_setpoints로 전송한다. sync_start()와 함께 쓰지 않는다.
+        :param period: 사이클 주기[s]
+        :param callback: callback(cycle, controller) → {'positions': ..., 'velocities': ..., 'torques': ...},
+                         위치만 ({node_id: 위치}/축 순서 배열, 모든 대상 축이 위치 모드일 때) 또는 None
+        :param phase_offset: SYNC 후 callback 실행까지의 고정 지연[s]
+        :param kwargs: CycleExecutor 옵션 (spin_threshold, history, priority, sync_counter)
+        """
+        self.cycle_stop()
+        self.sync_stop()
+        for node_id, motor in self.motors.items():
+            motor.set_dt(period)
+        self.sync_period = period
+        self.state.snapshot_timeout = period / 2
+        self.cycle_executor = CycleExecutor(self, period, callback, phase_offset, **kwargs)
+        self.cycle_executor.start()
+        return self.cycle_executor
+
+    def cycle_stop(self):
+        """실시간 사이클 정지"""
+        if self.cycle_executor is not None:
+            self.cycle_executor.stop()
+
+    def sync_monitor_start(self, jitter_threshold=None, missing_threshold=1, callback=None, period=None):
+        """SYNC jitter / 빠진 사이클 / 축별 TPDO 누락 감시 시작
+        자기 SYNC 프레임을 받아야 하므로 receive_own_messages=True로 연결되어 있어야 한다.
+        :param jitter_threshold: |SYNC 간격 - 주기|가 이 값[s]을 넘으면 callback('jitter', info)
+        :param missing_threshold: 한 축이 한 사이클에 이 수 이상 TPDO를 놓치면 callback('missing_tpdo', info)
+        :param callback: callback(event, info), 빠진 SYNC는 callback('missed_sync', info)
+        :param period: 명목 SYNC 주기[s] (None이면 sync_start/cycle_start의 주기)
+        :return: SyncMonitor
+        """
+        self.sync_monitor_stop()
+        if not self.receive_own_messages:
+            print("[SyncMonitor] receive_own_messages=False: 자기 SYNC 프레임을 받지 못할 수 있습니다")
+        period = period or self.sync_period
+        if period is None:
+            raise ValueError("SYNC 주기를 알 수 없습니다 (sync_start/cycle_start 후 실행하거나 period 지정)")
+        overflow = self.cycle_executor.sync_counter if self.cycle_executor is not None else 0
+        self.sync_monitor = SyncMonitor(self.network, self.state, period, jitter_threshold, missing_threshold,
+                                        callback, overflow or 240)
+        self.sync_monitor.start()
+        self.update_filters()
+        return self.sync_monitor
+
+    def sync_monitor_stop(self):
+        if self.sync_monitor is not None:
+            self.sync_monitor.stop()
+            self.sync_monitor = None
+            self.update_filters()
+
+    def get_sync_stats(self):
+        """SYNC 통계 (syncs, missed_cycles, jitter_mean/p99/max [s], 축별 missing_tpdo), 감시 중이 아니면 None"""
+        if self.sync_monitor is None:
+            return None
+        return self.sync_monitor.get_stats()
+
+    def bus_load_start(self, window=1.0, bucket=0.1, stuffing='worst', summary_interval=None):
+        """버스 사용량(프레임/비트 수, 점유율) 집계 시작 (COB-ID별, 노드별)
+        내가 보낸 프레임도 세려면 receive_own_messages=True로 연결되어 있어야 한다.
+        :param window: 점유율 계산 구간[s]
+        :param bucket: 집계 단위[s]
+        :param stuffing: 'worst'(최대 stuff 비트), 'exact'(CRC 포함 실제 계산, 프레임당 수십 us), 'none'
+        :param summary_interval: 지정하면 이 주기[s]마다 요약 출력
+        :return: BusLoadMonitor
+        """
+        self.bus_load_stop()
+        if self.network.notifier is None:
+            raise RuntimeError("버스에 연결되어 있지 않아 버스 사용량을 집계할 수 없습니다")
+        if not self.receive_own_messages:
+            print("[BusLoad] receive_own_messages=False: 내가 보낸 프레임(SYNC, RPDO, SDO 요청)은 집계되지 않습니다")
+        self.bus_load = BusLoadMonitor(self.bitrate, window, bucket, stuffing, clock=self.clock)
+        self.update_filters()
+        self.network.notifier.add_listener(self.bus_load)
+        if summary_interval:
+            self.bus_load.start_summary(summary_interval)
+        return self.bus_load
+
+    def bus_load_stop(self):
+        if self.bus_load is not None:
+            self.bus_load.stop_summary()
+            if self.network.notifier is not None:
+                self.network.notifier.remove_listener(self.bus_load)
+            self.bus_load = None
+            self.update_filters()
+
+    def get_bus_load(self, window=None):
+        """최근 window[s]의 버스 사용량 (utilization, by_cob_id, by_node 등), 집계 중이 아니면 None"""
+        if self.bus_load is None:
+            return None
+        return self.bus_load.get_stats(window)
+
+    def capture_start(self, filename=None):
+        """버스에서 수신한 모든 프레임을 timestamp와 함께 파일로 기록 시작
+        형식은 확장자로 정해진다 (.blf, .asc, .trc, .log, .csv, .db 등 can.Logger 지원 형식).
+        내가 보낸 프레임(SYNC, RPDO, SDO 요청)도 기록하려면 receive_own_messages=True로 연결되어 있어야 한다.
+        :param filename: 기록 파일 경로 (None이면 can_capture_<timestamp>.blf)
+        :return: can.Logger
+        """
+        self.capture_stop()
+        if self.network.notifier is None:
+            raise RuntimeError("버스에 연결되어 있지 않아 캡처할 수 없습니다")
+        if not self.receive_own_messages:
+            print("[Capture] receive_own_messages=False: 내가 보낸 프레임은 기록되지 않습니다")
+        if filename is None:
+            filename = f"can_capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.blf"
+        self.capture = can.Logger(filename)
+        self.update_filters()
+        self.network.notifier.add_listener(self.capture)
+        return self.capture
+
+    def capture_stop(self):
+        """캡처 종료 (파일을 닫음)"""
+        if self.capture is not None:
+            if self.network.notifier is not None:
+                self.network.notifier.remove_listener(self.capture)
+            self.capture.stop()
+            self.capture = None
+            self.update_filters()
+
+    def replay(self, filename, speed=1.0, background=False):
+        """기록된 로그를 버스 대신 network.notify로 재생 (기록된 timestamp 그대로 전달)
+        등록된 모터의 수신 콜백이 실제 수신과 같은 경로로 실행되므로 디코딩/콜백 비용 측정이나
+        타이밍 문제 재현에 사용한다. 버스 없이(connect=False) 쓸 때는 pdo_mapping_local_all,
+        pdo_callback_register_all을 먼저 실행한다.
+        :param filename: 로그 파일 경로 (can.LogReader 지원 형식)
+        :param speed: 재생 속도 배율 (1.0 = 원래 속도, 0 또는 None = 대기 없이 최대 속도)
+        :param background: True면 백그라운드 스레드에서 재생하고 바로 반환
+        :return: LogReplayer (get_stats()로 frames, notify_time 등 확인)
+        """
+        self.replay_stop()
+        self.replayer = LogReplayer(self.network, filename, speed)
+        if background:
+            self.replayer.start()
+        else:
+            self.replayer.run()
+        return self.replayer
+
+    def replay_stop(self):
+        if self.replayer is not None:
+            self.replayer.stop()
+
+    def get_cycle_stats(self):
+        """실시간 사이클 통계 (사이클 수, 건너뛴 사이클 수, SYNC 전송 지연)"""
+        if self.cycle_executor is None:
+            return None
+        return self.cycle_executor.get_stats()
+
+    def _axis_values(self, values):
+        """일괄 setpoint 입력을 (slot 인덱스, 모터 목록, float 배열)로 변환
+        :param values: 축 순서(state.node_ids) 배열/시퀀스 또는 {node_id: 값} 딕셔너리
+        """
+        if isinstance(values, dict):
+            slots = [self.state.slots[node_id] for node_id in values]
+            motors = [self.axis_motors[slot] for slot in slots]
+            return slots, motors, np.fromiter(values.values(), np.float64, len(values))
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(self.axis_motors),):
+            raise ValueError(f"축 수({len(self.axis_motors)})와 다른 크기의 setpoint 배열입니다: {values.shape}")
+        return slice(0, len(self.axis_motors)), self.axis_motors, values
+
+    def set_positions(self, values, units='pulse'):
+        """축마다 다른 목표 위치를 한 번에 전송
+        zero offset과 단위 변환을 배열 연산 한 번으로 처리한 뒤 모든 축의 RPDO를 연달아 보낸다.
+        :param values: 축 순서(state.node_ids) 배열 또는 {node_id: 위치} 딕셔너리
+        :param units: 'pulse'(set_position과 같은 드라이브 단위) 또는 'rad'
+        """
+        slots, motors, values = self._axis_values(values)
+        state = self.state
+        if units == 'rad':
+            values = values / state.position_scale[slots]
+        elif units != 'pulse':
+            raise ValueError(f"지원하지 않는 위치 단위입니다: {units}")
+        targets = np.rint(values + state.zero_offset[slots])
+        state.target_position[slots] = targets
+        for motor, target in zip(motors, targets.astype(np.int64).tolist()):
+            motor.send_target_position(target)
+
+    def set_torques(self, values):
+        """축마다 다른 목표 토크(드라이브 단위)를 한 번에 전송
+        :param values: 축 순서(state.node_ids) 배열 또는 {node_id: 토크} 딕셔너리
+        """
+        slots, motors, values = self._axis_values(values)
+        targets = np.rint(values)
+        self.state.target_torque[slots] = targets
+        for motor, target in zip(motors, targets.astype(np.int64).tolist()):
+            motor.send_target_torque(target)
 
     def set_position_all(self, value):
         """등록된 모든 모터에 동일 위치를 세팅"""
         for node_id, motor in self.motors.items():
             motor.set_position(value)            
     
+    def set_setpoint_mode_all(self, mode):
+        """등록된 모든 모터의 setpoint 전송 방식 설정 ('HANDSHAKE' 또는 'STREAMING')"""
+        for node_id, motor in self.motors.items():
+            if hasattr(motor, 'set_setpoint_mode'):
+                motor.set_setpoint_mode(mode)
+
     def set_position(self, node_id, value):
         if node_id in self.motors:
             self.motors[node_id].set_position(value)
@@ -126,8 +504,34 @@ class MotorController:
             print(f"Node {node_id} not found in motors dictionary.")
 
     def get_torque_all(self):
-        for node_id, motor in self.motors.items():
-            motor.get_torque()
+        """등록된 모든 모터의 토크를 배열로 반환 (축 순서는 state.node_ids)"""
+        return self.state.get('torque')
+
+    def get_state_array(self, signal, copy=False):
+        """모든 축의 신호 배열 반환 (dict 생성 없음, 축 순서는 state.node_ids)
+        :param signal: 'position', 'velocity', 'torque', 'acceleration', 'statusword'
+        :param copy: False면 읽기 전용 view(수신 스레드가 계속 갱신), True면 복사본
+        """
+        return self.state.get(signal, copy)
+
+    def get_positions_array(self, copy=False):
+        return self.state.get('position', copy)
+
+    def get_velocities_array(self, copy=False):
+        return self.state.get('velocity', copy)
+
+    def get_torques_array(self, copy=False):
+        return self.state.get('torque', copy)
+
+    def get_accelerations_array(self, copy=False):
+        return self.state.get('acceleration', copy)
+
+    def get_snapshot(self):
+        """마지막으로 완성된 SYNC 사이클의 스냅샷 (Snapshot, 아직 없으면 None)
+        한 사이클의 모든 축 값이 함께 들어 있으며, 배열은 읽기 전용 복사본이다.
+        snapshot.cycle로 새 사이클인지, snapshot.complete로 모든 TPDO가 수신됐는지 확인한다.
+        """
+        return self.state.snapshot
 
     def get_torque(self, node_id):
         if node_id in self.motors:
@@ -135,12 +539,51 @@ class MotorController:
         else:
             print(f"Node {node_id} not found in motors dictionary.")
 
+    def set_velocity_all(self, value):
+        for node_id, motor in self.motors.items():
+            motor.set_velocity(value)
+
+    def set_velocity(self, node_id, value):
+        if node_id in self.motors:
+            self.motors[node_id].set_velocity(value)
+        else:
+            print(f"Node {node_id} not found in motors dictionary.")
+
     def get_velocity(self, node_id):
         if node_id in self.motors:
             return self.motors[node_id].get_velocity()
         else:
             print(f"Node {node_id} not found in motors dictionary.")
 
+    def latency_start_all(self, bin_width=0.0001, max_latency=0.1):
+        """모든 모터의 setpoint → 피드백 지연 측정 시작
+        :param bin_width: 히스토그램 bin 폭[s]
+        :param max_latency: 히스토그램 범위[s]
+        """
+        for node_id, motor in self.motors.items():
+            motor.latency_start(bin_width, max_latency, self.sync_period)
+
+    def latency_stop_all(self):
+        for node_id, motor in self.motors.items():
+            motor.latency_stop()
+
+    def get_latency_stats(self):
+        """측정 중인 모터별 지연 통계 {node_id: {'count', 'superseded', 'early', 'mean', 'min', 'p50', 'p99', 'max', 'cycles'}}"""
+        stats = {}
+        for node_id, motor in self.motors.items():
+            motor_stats = motor.get_latency_stats()
+            if motor_stats is not None:
+                stats[node_id] = motor_stats
+        return stats
+
+    def set_estimator_all(self, estimator='finite_difference', **kwargs):
+        """모든 모터의 가속도 추정기 설정 (모터마다 새 추정기 생성)
+        :param estimator: 'finite_difference', 'alpha_beta', 'polyfit' 또는 추정기 클래스
+        :param kwargs: 추정기 생성 인자
+        """
+        for node_id, motor in self.motors.items():
+            motor.set_estimator(estimator, **kwargs)
+
     def get_acceleration(self, node_id):
         if node_id in self.motors:
             return self.motors[node_id].get_acceleration()
@@ -149,9 +592,42 @@ class MotorController:
 
     def disconnect(self):
         """네트워크 해제"""
-        self.network.sync.stop()
+        self.cycle_stop()
+        self.record_stop()
+        self.sync_monitor_stop()
+        self.bus_load_stop()
+        self.capture_stop()
+        self.replay_stop()
+        self.sync_stop()
         self.network.disconnect()
 
+    def record_start(self, filename=None, capacity=16384, flush_interval=0.1):
+        """모든 축을 SYNC 사이클 단위로 한 파일에 기록 시작 (binary_log 형식)
+        사이클 스냅샷이 발행될 때마다 목표값, 실제 위치/속도/토크, statusword, 수신 시각을 레코드 하나로 기록한다.
+        :param filename: 기록 파일 경로 (None이면 fleet_log_<timestamp>.bin)
+        :return: FleetRecorder
+        """
+        self.record_stop()
+        if filename is None:
+            filename = f"fleet_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin"
+        # 헤더의 샘플 주기는 모든 축이 공유하는 SYNC 주기 (sync_start/cycle_start 이전이면 None)
+        self.recorder = FleetRecorder(self.state, filename, capacity, flush_interval, self.sync_period,
+                                      clock=self.clock)
+        self.recorder.start()
+        return self.recorder
+
+    def record_stop(self):
+        """사이클 기록 종료 (남은 레코드를 모두 기록한 뒤 파일을 닫음)"""
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+
+    def get_record_stats(self):
+        """사이클 기록 통계 (기록/버린 레코드 수 등), 기록 중이 아니면 None"""
+        if self.recorder is None:
+            return None
+        return self.recorder.get_stats()
+
     def log_start_all(self):
         """모든 모터의 로그 기록 시작"""
         for node_id, motor in self.motors.items():
@@ -162,6 +638,16 @@ class MotorController:
         for node_id, motor in self.motors.items():
             motor.log_stop()
 
+    def get_log_stats(self):
+        """로그 중인 모터별 로그 통계 {node_id: {'written', 'dropped', 'overruns', 'pending'}}"""
+        stats = {}
+        for node_id, motor in self.motors.items():
+            if hasattr(motor, 'get_log_stats'):
+                motor_stats = motor.get_log_stats()
+                if motor_stats is not None:
+                    stats[node_id] = motor_stats
+        return stats
+
     def log_start(self, node_id):
         """특정 모터의 로그 기록 시작"""
         if node_id in self.motors:
@@ -0,0 +1,159 @@
+import copy
+import hashlib
+import os
+import pickle
+import threading
+
+import canopen
+from canopen.objectdictionary import ODVariable, import_od
+from canopen.objectdictionary.eds import _convert_variable
+
+
+class ODCache:
+    """EDS 파싱 결과(ObjectDictionary)를 파일 내용 해시 기준으로 캐시한다.
+
+    - 프로세스 내부: 같은 EDS를 쓰는 노드들은 한 번만 파싱한다.
+    - 디스크(pickle): 다음 프로세스 시작 시 파싱을 완전히 건너뛴다.
+
+    캐시에는 node_id 없이 파싱한 템플릿을 저장한다. 노드별 ObjectDictionary는 템플릿의
+    객체를 공유하고, $NODEID 식이 들어있는 항목(COB-ID 등)만 복사해서 다시 계산한다.
+    """
+    DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'robot_canopen_motor', 'od')
+
+    def __init__(self, cache_dir=DEFAULT_DIR):
+        """
+        :param cache_dir: pickle 파일 저장 경로. None이면 디스크 캐시를 사용하지 않음
+        """
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._templates = {}  # {key: (템플릿 od, $NODEID 항목을 가진 index 목록)}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(content):
+        # canopen 버전이 바뀌면 pickle 구조가 달라질 수 있으므로 키에 포함
+        digest = hashlib.sha256(content)
+        digest.update(canopen.__version__.encode())
+        return digest.hexdigest()
+
+    def load(self, eds_path, node_id):
+        """node_id에 맞게 해석된 ObjectDictionary 반환"""
+        with open(eds_path, 'rb') as f:
+            content = f.read()
+        key = self._key(content)
+
+        with self._lock:
+            entry = self._templates.get(key)
+            if entry is None:
+                template = self._load_template(key, eds_path)
+                entry = (template, self._relative_indices(template))
+                self._templates[key] = entry
+            else:
+                self.hits += 1
+        template, relative_indices = entry
+        return self._node_view(template, relative_indices, node_id or template.node_id)
+
+    def clear(self):
+        """프로세스 내부 캐시 비우기 (디스크 캐시는 유지)"""
+        with self._lock:
+            self._templates.clear()
+
+    def _load_template(self, key, eds_path):
+        blob = self._read_disk(key)
+        if blob is not None:
+            try:
+                od = pickle.loads(blob)
+                self.hits += 1
+                return od
+            except Exception as e:
+                print(f"[ODCache] 디스크 캐시 로드 실패, 다시 파싱합니다: {e}")
+        self.misses += 1
+        od = import_od(eds_path, None)
+        self._write_disk(key, pickle.dumps(od, pickle.HIGHEST_PROTOCOL))
+        return od
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pickle')
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, blob):
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[ODCache] 디스크 캐시 저장 실패: {e}")
+
+    @staticmethod
+    def _is_relative(var):
+        # EDS에는 '$NodeID'처럼 대소문자가 섞여 있을 수 있음
+        for raw in (getattr(var, 'default_raw', None), getattr(var, 'value_raw', None)):
+            if raw and '$NODEID' in raw.upper():
+                return True
+        return False
+
+    @classmethod
+    def _relative_indices(cls, od):
+        indices = []
+        for index, obj in od.indices.items():
+            members = [obj] if isinstance(obj, ODVariable) else obj.subindices.values()
+            if any(cls._is_relative(var) for var in members):
+                indices.append(index)
+        return indices
+
+    @staticmethod
+    def _resolve(var, node_id):
+        """$NODEID 식을 node_id 기준으로 다시 계산 (eds.import_eds와 같은 규칙)"""
+        for raw_attr, attr in (('default_raw', 'default'), ('value_raw', 'value')):
+            raw = getattr(var, raw_attr, None)
+            if raw and '$NODEID' in raw.upper():
+                try:
+                    setattr(var, attr, _convert_variable(node_id, var.data_type, raw))
+                except ValueError:
+                    setattr(var, attr, None)
+
+    @classmethod
+    def _node_view(cls, template, relative_indices, node_id):
+        """템플릿을 공유하면서 $NODEID 항목만 노드별로 복사한 ObjectDictionary 생성"""
+        od = copy.copy(template)
+        od.indices = dict(template.indices)
+        od.names = dict(template.names)
+        for index in relative_indices:
+            obj = template.indices[index]
+            if isinstance(obj, ODVariable):
+                new_obj = copy.copy(obj)
+                new_obj.parent = od
+                cls._resolve(new_obj, node_id)
+            else:
+                new_obj = copy.copy(obj)
+                new_obj.parent = od
+                new_obj.subindices = dict(obj.subindices)
+                new_obj.names = dict(obj.names)
+                for subindex, var in obj.subindices.items():
+                    if cls._is_relative(var):
+                        new_var = copy.copy(var)
+                        new_var.parent = new_obj
+                        cls._resolve(new_var, node_id)
+                        new_obj.subindices[subindex] = new_var
+                        new_obj.names[new_var.name] = new_var
+            od.indices[index] = new_obj
+            od.names[obj.name] = new_obj
+        return od
+
+
+# 프로세스 전체에서 공유하는 기본 캐시
+default_od_cache = ODCache()
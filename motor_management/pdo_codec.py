@@ -0,0 +1,68 @@
+import struct
+
+
+def pdo_struct(pdo_map):
+    """PDO 매핑으로부터 struct.Struct 생성
+    바이트 단위로 정렬되고 OD 데이터 타입 크기 그대로 매핑된 변수만 지원한다.
+    :raises ValueError: struct로 표현할 수 없는 매핑 (비트 단위 매핑, 24/40/48/56비트 타입 등)
+    """
+    fmt = '<'
+    for var in pdo_map.map:
+        od_struct = var.od.STRUCT_TYPES.get(var.od.data_type)
+        if (not isinstance(od_struct, struct.Struct) or var.offset % 8
+                or od_struct.size * 8 != var.length):
+            raise ValueError(f"{pdo_map.name}: '{var.name}'은(는) struct로 디코딩할 수 없는 매핑입니다")
+        fmt += od_struct.format.lstrip('<')
+    return struct.Struct(fmt)
+
+
+class PdoDecoder:
+    """TPDO 매핑으로부터 미리 만든 struct로 원시 프레임의 모든 필드를 한 번에 디코딩한다.
+
+    network.subscribe(cob_id, handler)로 등록한 핸들러에서 unpack(data)를 호출하면
+    canopen의 PdoMap.on_message를 거치지 않고 매핑 순서대로 값 튜플을 얻는다.
+    """
+
+    def __init__(self, pdo_map):
+        self.cob_id = pdo_map.cob_id
+        self.names = [var.od.name for var in pdo_map.map]
+        self.struct = pdo_struct(pdo_map)
+        self.unpack = self.struct.unpack_from
+
+    def index(self, name):
+        """매핑된 변수의 필드 위치"""
+        return self.names.index(name)
+
+
+class PdoEncoder:
+    """RPDO 매핑으로부터 미리 만든 struct와 재사용 버퍼로 프레임을 만들어 바로 전송한다.
+
+    PdoMap의 이름 기반 변수 조회와 .phys 인코딩을 거치지 않으며,
+    PdoMap.transmit()과 같은 COB-ID/데이터 길이의 프레임을 만든다.
+    """
+
+    def __init__(self, pdo_map, fields):
+        """
+        :param pdo_map: 매핑이 설정된 RPDO
+        :param fields: send()에 넘길 값의 순서 (매핑 순서와 같아야 함)
+        :raises ValueError: 매핑이 fields와 다르거나 struct로 표현할 수 없는 경우
+        """
+        names = [var.od.name for var in pdo_map.map]
+        if names != list(fields):
+            raise ValueError(f"{pdo_map.name}: 매핑 {names}이(가) {list(fields)}와 다릅니다")
+        self.cob_id = pdo_map.cob_id
+        self.names = names
+        self.struct = pdo_struct(pdo_map)
+        self.buffer = bytearray(self.struct.size)
+        self._pack_into = self.struct.pack_into
+        self.network = pdo_map.pdo_node.network
+
+    def pack(self, *values):
+        """버퍼에 값을 채우고 버퍼를 반환 (전송하지 않음)"""
+        self._pack_into(self.buffer, 0, *values)
+        return self.buffer
+
+    def send(self, *values):
+        """값을 매핑 순서대로 채워 즉시 전송"""
+        self._pack_into(self.buffer, 0, *values)
+        self.network.send_message(self.cob_id, self.buffer)
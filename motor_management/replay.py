@@ -0,0 +1,111 @@
+import threading
+import time
+
+import can
+
+
+class LogReplayer:
+    """기록된 CAN 로그(.blf, .asc, .trc, .log, .csv, .db 등 can.LogReader 지원 형식)를
+    버스 없이 canopen Network.notify로 다시 흘려보내는 재생기.
+
+    프레임은 기록된 timestamp 그대로 전달되므로 가속도 추정, 사이클 스냅샷 등 수신 시각 기반 처리가
+    원래 세션과 같은 시각으로 동작한다. notify 호출 시간을 합산해 디코딩/콜백 비용을 측정한다.
+    """
+
+    def __init__(self, network, filename, speed=1.0, skip=60.0):
+        """
+        :param network: canopen.Network (버스 연결 없이 사용 가능)
+        :param filename: 재생할 로그 파일 경로
+        :param speed: 재생 속도 배율 (1.0 = 원래 속도, 10.0 = 10배속, 0 또는 None = 대기 없이 최대 속도)
+        :param skip: 이 값[s]보다 긴 프레임 간 공백은 건너뛴다
+        """
+        self.network = network
+        self.filename = filename
+        self.speed = speed
+        self.skip = skip
+
+        self.frames = 0        # notify로 전달한 프레임 수
+        self.skipped = 0       # 전달하지 않은 프레임 수 (error/remote frame)
+        self.notify_time = 0.0  # notify 호출에 걸린 시간 합[s] (디코딩 + 콜백)
+        self.notify_max = 0.0   # 가장 오래 걸린 notify 한 번[s]
+        self.wall_time = 0.0    # 재생에 걸린 실제 시간[s]
+        self.log_duration = 0.0  # 로그 상의 첫 프레임 ~ 마지막 프레임 시간[s]
+        self._running = False
+        self._thread = None
+
+    def run(self):
+        """현재 스레드에서 끝까지(또는 stop()까지) 재생"""
+        self._running = True
+        network = self.network
+        speed = self.speed
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        first = None
+        offset = 0.0  # 건너뛴 공백의 합[s]
+        previous = None
+        try:
+            with can.LogReader(self.filename) as reader:
+                for msg in reader:
+                    if not self._running:
+                        break
+                    if msg.is_error_frame or msg.is_remote_frame:
+                        self.skipped += 1
+                        continue
+                    timestamp = msg.timestamp
+                    if first is None:
+                        first = timestamp
+                    elif timestamp - previous > self.skip:
+                        offset += timestamp - previous
+                    previous = timestamp
+
+                    if speed:
+                        # 로그 상의 경과 시간에 맞춰 대기
+                        remaining = (timestamp - first - offset) / speed - (perf_counter() - start)
+                        if remaining > 0:
+                            time.sleep(remaining)
+
+                    t0 = perf_counter()
+                    network.notify(msg.arbitration_id, msg.data, timestamp)
+                    elapsed = perf_counter() - t0
+                    self.notify_time += elapsed
+                    if elapsed > self.notify_max:
+                        self.notify_max = elapsed
+                    self.frames += 1
+        finally:
+            self._running = False
+            self.wall_time = perf_counter() - start
+            if first is not None:
+                self.log_duration = previous - first
+        return self.get_stats()
+
+    def start(self):
+        """백그라운드 스레드에서 재생 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self.run, name='log-replay', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait(self, timeout=None):
+        """백그라운드 재생이 끝날 때까지 대기, 끝났으면 True"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def get_stats(self):
+        """재생 통계 (시간 단위: s)"""
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'log_duration': self.log_duration,
+            'wall_time': self.wall_time,
+            'notify_time': self.notify_time,
+            'notify_mean': self.notify_time / self.frames if self.frames else 0.0,
+            'notify_max': self.notify_max,
+        }
@@ -0,0 +1,129 @@
+import csv
+import threading
+
+import numpy as np
+
+
+class CsvLogWriter:
+    """RingBufferLogger용 CSV 기록기 (첫 열은 시간[ms])"""
+
+    def __init__(self, filename, header, fmt='%.6f', time_fmt='%.1f'):
+        self.filename = filename
+        self.header = list(header)
+        self.fmt = [time_fmt] + [fmt] * (len(self.header) - 1)
+        self._file = None
+
+    def open(self, start_time):
+        self._file = open(self.filename, 'w', newline='')
+        csv.writer(self._file).writerow(self.header)
+
+    def write(self, rows):
+        np.savetxt(self._file, rows, fmt=self.fmt, delimiter=',', newline='\r\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RingBufferLogger:
+    """수신 스레드에서는 숫자 샘플만 미리 잡아둔 링 버퍼에 넣고, 파일 쓰기는 백그라운드 스레드가 하는 로거.
+
+    push()는 수신 스레드(단일 생산자), 기록 스레드는 단일 소비자로 동작하며
+    각각 자기 인덱스(_head / _tail)만 갱신하므로 잠금이 필요 없다.
+    버퍼가 가득 차면 새 샘플은 버리고 dropped/overruns만 늘린다. (수신 경로는 절대 기다리지 않음)
+    """
+
+    def __init__(self, writer, columns, capacity=65536, flush_interval=0.1, time_column=True):
+        """
+        :param writer: 기록기 (CsvLogWriter 또는 BinaryLogWriter: open(start_time), write(rows), close())
+        :param columns: 샘플 하나의 값 개수
+        :param capacity: 버퍼에 담을 수 있는 최대 샘플 수
+        :param flush_interval: 기록 스레드가 버퍼를 비우는 주기[s]
+        :param time_column: True면 첫 열을 시각[s]으로 받아 시작 시각 기준 ms로 변환해 기록
+        """
+        self.writer = writer
+        self.filename = writer.filename
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.time_column = time_column
+        self._buffer = np.zeros((capacity, columns))
+        self._head = 0  # push한 샘플 수 (생산자만 갱신)
+        self._tail = 0  # 기록한 샘플 수 (소비자만 갱신)
+        self._overrun = False
+
+        self.written = 0    # 파일에 기록한 샘플 수
+        self.dropped = 0    # 버퍼가 가득 차서 버린 샘플 수
+        self.overruns = 0   # 버퍼가 가득 찬 횟수 (연속으로 버린 구간 수)
+        self.start_time = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self, start_time):
+        """파일을 열고 기록 스레드 시작
+        :param start_time: 시간 열의 기준 시각[s] (push에 넘기는 시각과 같은 시계)
+        """
+        self.start_time = start_time
+        self.writer.open(start_time)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f'log-writer-{self.filename}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """남은 샘플을 모두 기록하고 파일 닫기"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.writer.close()
+
+    def push(self, *values):
+        """샘플 하나를 버퍼에 추가 (수신 스레드에서 호출, 버퍼가 가득 차면 버리고 False 반환)"""
+        return self.push_row(values)
+
+    def push_row(self, row):
+        """값 시퀀스/배열 하나를 샘플로 추가 (push와 같음)"""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            if not self._overrun:
+                self._overrun = True
+                self.overruns += 1
+            return False
+        self._overrun = False
+        self._buffer[head % self.capacity] = row
+        self._head = head + 1
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        head = self._head
+        tail = self._tail
+        if head == tail:
+            return
+        # 복사한 뒤 바로 _tail을 옮겨 생산자가 빈 공간을 쓸 수 있게 한다
+        rows = self._buffer.take(np.arange(tail, head) % self.capacity, axis=0)
+        self._tail = head
+        if self.time_column:
+            rows[:, 0] = (rows[:, 0] - self.start_time) * 1000  # ms 단위로 변환
+        self.writer.write(rows)
+        self.written += len(rows)
+
+    @property
+    def pending(self):
+        """아직 기록되지 않은 샘플 수"""
+        return self._head - self._tail
+
+    def get_stats(self):
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'overruns': self.overruns,
+            'pending': self.pending,
+        }
@@ -0,0 +1,129 @@
+import numpy as np
+
+from .latency import LatencyHistogram
+
+
+class SyncMonitor:
+    """자기 SYNC 프레임(0x80)의 수신 시각과 그 뒤의 TPDO 수신을 감시한다.
+
+    - SYNC 간격과 명목 주기의 차이(jitter)를 히스토그램으로 모은다.
+    - SYNC 간격(또는 SYNC counter)으로 빠진 사이클 수를 센다.
+    - SYNC마다 직전 사이클에 축별로 받지 못한 TPDO 수를 센다. (FleetState.rx_count 기준)
+    - 임계값을 넘으면 callback(event, info)를 수신 스레드에서 호출한다.
+      event: 'jitter', 'missed_sync', 'missing_tpdo'
+
+    SYNC를 내가 보내므로 버스가 자기 프레임을 돌려주도록(receive_own_messages=True) 연결되어 있어야 한다.
+    """
+    COB_ID = 0x80
+
+    def __init__(self, network, state, period, jitter_threshold=None, missing_threshold=1, callback=None,
+                 sync_overflow=240, bin_width=0.00005, max_jitter=0.05):
+        """
+        :param network: canopen.Network
+        :param state: FleetState (TPDO 수신 수 비교용)
+        :param period: 명목 SYNC 주기[s]
+        :param jitter_threshold: |jitter|가 이 값[s]을 넘으면 'jitter' 이벤트 (None이면 사용 안 함)
+        :param missing_threshold: 한 축이 한 사이클에 이 수 이상 TPDO를 놓치면 'missing_tpdo' 이벤트
+        :param callback: callback(event, info) (수신 스레드에서 호출되므로 빨리 반환해야 함)
+        :param sync_overflow: SYNC counter를 쓸 때 counter가 1로 돌아가기 전의 최대값
+        :param bin_width: jitter 히스토그램 bin 폭[s]
+        :param max_jitter: jitter 히스토그램 범위[s]
+        """
+        self.network = network
+        self.state = state
+        self.period = period
+        self.jitter_threshold = jitter_threshold
+        self.missing_threshold = missing_threshold
+        self.callback = callback
+        self.sync_overflow = sync_overflow
+
+        self.jitter = LatencyHistogram(bin_width, max_jitter)  # |SYNC 간격 - period|
+        self.syncs = 0              # 받은 SYNC 수
+        self.missed_cycles = 0      # 빠진 SYNC 사이클 수
+        self.missing_tpdo = np.zeros(state.capacity, dtype=np.int64)  # 축(slot)별 놓친 TPDO 누적 수
+        self._last_time = None
+        self._last_counter = None
+        self._last_rx_count = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._last_time = None
+        self._last_counter = None
+        self._last_rx_count = None
+        self.network.subscribe(self.COB_ID, self._on_sync)
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self.network.unsubscribe(self.COB_ID, self._on_sync)
+
+    def _emit(self, event, info):
+        if self.callback is not None:
+            try:
+                self.callback(event, info)
+            except Exception as e:
+                print(f"[SyncMonitor] callback 오류: {e}")
+
+    def _on_sync(self, can_id, data, timestamp):
+        self.syncs += 1
+        last_time = self._last_time
+        self._last_time = timestamp
+
+        if last_time is not None:
+            interval = timestamp - last_time
+            jitter = interval - self.period
+            self.jitter.add(abs(jitter))
+            if self.jitter_threshold is not None and abs(jitter) > self.jitter_threshold:
+                self._emit('jitter', {'jitter': jitter, 'interval': interval, 'sync': self.syncs})
+
+            # SYNC counter가 있으면 정확히, 없으면 간격으로 빠진 사이클 수 계산
+            if data:
+                counter = data[0]
+                if self._last_counter is not None:
+                    # counter는 1 ~ sync_overflow를 순환
+                    missed = (counter - self._last_counter - 1) % self.sync_overflow
+                else:
+                    missed = 0
+                self._last_counter = counter
+            else:
+                missed = max(0, int(round(interval / self.period)) - 1)
+            if missed:
+                self.missed_cycles += missed
+                self._emit('missed_sync', {'missed': missed, 'interval': interval, 'sync': self.syncs})
+
+        self._check_tpdo()
+
+    def _check_tpdo(self):
+        state = self.state
+        count = len(state)
+        rx_count = state.rx_count[:count].copy()
+        last = self._last_rx_count
+        self._last_rx_count = rx_count
+        if last is None or len(last) != count:
+            return
+        # 직전 SYNC 이후 받은 TPDO 수와 사이클당 기대 수 비교
+        missing = state.rx_expected[:count] - (rx_count - last)
+        np.maximum(missing, 0, out=missing)
+        if not missing.any():
+            return
+        self.missing_tpdo[:count] += missing
+        for slot in np.flatnonzero(missing >= self.missing_threshold):
+            self._emit('missing_tpdo', {'node_id': state.node_ids[slot], 'missing': int(missing[slot]),
+                                        'sync': self.syncs})
+
+    def get_stats(self):
+        """SYNC 통계 (jitter 단위: s)"""
+        jitter = self.jitter
+        return {
+            'syncs': self.syncs,
+            'missed_cycles': self.missed_cycles,
+            'jitter_mean': jitter.total / jitter.count if jitter.count else 0.0,
+            'jitter_p99': jitter.percentile(99),
+            'jitter_max': jitter.max,
+            'missing_tpdo': {node_id: int(self.missing_tpdo[slot])
+                             for slot, node_id in enumerate(self.state.node_ids)},
+        }
@@ -13,9 +13,9 @@ class MotorVendorB(AbstractMotor):
         print(f"[VendorB] Reset motor node: {self.node_id}")
         pass
 
-    def pdo_mapping(self):
+    def pdo_mapping(self, verify=True):
         print(f"[VendorB] PDO mapping for node: {self.node_id}")
-        pass
+        return None  # 매핑을 확인하지 않음
 
     def set_position(self, value):
         print(f"[VendorB] Set position to {value}, node: {self.node_id}")
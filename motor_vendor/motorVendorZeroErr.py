@@ -1,14 +1,51 @@
+import canopen
 from motor_management.abstract_motor import AbstractMotor
-import time
-import csv
+from motor_management.pdo_codec import PdoDecoder, PdoEncoder
+from motor_management.ring_logger import RingBufferLogger, CsvLogWriter
+from motor_management.binary_log import BinaryLogWriter
 from datetime import datetime
 
 class MotorVendorZeroErr(AbstractMotor):
     """제조사 A 모터에 대한 구체 구현."""
     PULSE_PER_REVOLUTION = 524288  # 한 바퀴당 펄스 수
+    STATE_TIMEOUT = 0.5  # Controlword를 쓴 뒤 Statusword가 기대 상태가 되기를 기다리는 최대 시간[s]
+    STATE_POLL = 0.002   # Statusword 조회 간격[s]
+    # CiA 402 Statusword 상태 (mask, value)
+    STATE_SWITCH_ON_DISABLED = (0x4F, 0x40)
+    STATE_READY_TO_SWITCH_ON = (0x6F, 0x21)
+    STATE_SWITCHED_ON = (0x6F, 0x23)
+    STATUS_FAULT = 0x08  # Statusword bit 3: fault
+    SETPOINT_ACK = 0x1000  # Statusword bit 12: set-point acknowledge (profile position)
+    NEW_SETPOINT = 0x10    # Controlword bit 4: new set-point
+    # set_position 전송 방식
+    #   'HANDSHAKE': Controlword 0x2F → 0x3F 두 프레임으로 매번 new set-point 엣지 생성 (기본)
+    #   'STREAMING': 한 프레임만 전송하고, TPDO1의 set-point acknowledge에 맞춰 bit 4를 토글
+    #                (bit 4를 내리는 프레임이 필요하므로 새 목표값은 최대 두 사이클에 한 번 latch됨)
+    SETPOINT_MODES = ('HANDSHAKE', 'STREAMING')
+    # SYNC마다 목표값을 받는 cyclic synchronous 모드 (RPDO 전송 타입 1)
+    CYCLIC_MODES = ('CYCLIC_SYNC_POSITION', 'CYCLIC_SYNC_VELOCITY', 'CYCLIC_SYNC_TORQUE')
+    CSP_CONTROLWORD = 0x0f  # Enable operation (cyclic 모드에서는 new set-point 엣지가 필요 없음)
+    # RPDO 번호별 목표값 변수 (각 RPDO는 Controlword + 목표값)
+    RPDO_TARGETS = {1: 'Target Position', 2: 'Target torque', 3: 'Target velocity'}
     
     def __init__(self, node_id, eds_path, zero_offset=0, operation_mode='PROFILE_POSITION'):
         super().__init__(node_id, eds_path, zero_offset, operation_mode)
+        self._rpdo_encoders = {number: None for number in self.RPDO_TARGETS}  # RPDO별 인코더, pdo_mapping 이후 생성
+        self.setpoint_mode = 'HANDSHAKE'
+        self._new_setpoint = False  # STREAMING 모드에서 마지막으로 보낸 Controlword bit 4
+        self.setpoint_acks = 0      # STREAMING 모드에서 drive가 acknowledge한 set-point 수
+        self._initialized = False
+        self.logger = None  # log_start로 생성되는 RingBufferLogger
+        self.plusToRad = 2 * 3.141592653589793 / self.PULSE_PER_REVOLUTION
+        self.position_scale = self.plusToRad
+
+    def set_setpoint_mode(self, mode):
+        """set_position 전송 방식 설정 ('HANDSHAKE' 또는 'STREAMING')"""
+        mode = mode.upper()
+        if mode not in self.SETPOINT_MODES:
+            raise ValueError(f"지원하지 않는 setpoint 모드입니다: {mode}")
+        self.setpoint_mode = mode
+        self._new_setpoint = False
         
     def init(self, operation_mode=None):
         if operation_mode:
@@ -30,7 +67,7 @@ class MotorVendorZeroErr(AbstractMotor):
         # 모드별 초기화
         self._init_mode_specific_parameters()
 
-        self.plusToRad = 2 * 3.141592653589793 / self.PULSE_PER_REVOLUTION
+        self._initialized = True
         
         # Disable sync
         self.network.sync.stop()
@@ -47,94 +84,234 @@ class MotorVendorZeroErr(AbstractMotor):
             self.node.sdo['Target torque'].raw = 0 #0x6071
             print(f'[write] Profile parameters set for Torque mode')
 
+        elif self.operation_mode == 'CYCLIC_SYNC_POSITION':
+            # 현재 위치에서 시작하도록 목표값을 실제 위치로 맞춘다 (enable 시 튀는 것 방지)
+            position = self.node.sdo['Position actual value'].raw
+            self.target_position = position
+            self.node.sdo['Target Position'].raw = position #0x607A
+            self._write_interpolation_period()
+            print(f'[write] Cyclic parameters set for CSP mode')
+
+        elif self.operation_mode == 'CYCLIC_SYNC_VELOCITY':
+            self.node.sdo['Target velocity'].raw = 0 #0x60FF
+            self._write_interpolation_period()
+            print(f'[write] Cyclic parameters set for CSV mode')
+
+        elif self.operation_mode == 'CYCLIC_SYNC_TORQUE':
+            self.node.sdo['Target torque'].raw = 0 #0x6071
+            self._write_interpolation_period()
+            print(f'[write] Cyclic parameters set for CST mode')
+
         else:
             print(f"지원하지 않는 동작 모드입니다: {self.operation_mode}")
             
+    @staticmethod
+    def _interpolation_period(dt):
+        """dt[s]를 0x60C2 (time units, time index) 표현으로 변환 (dt = units * 10^index)"""
+        for index in (-3, -4, -5, -6, -2, -1):
+            units = dt * 10 ** -index
+            if abs(units - round(units)) < 1e-6 and round(units) <= 0xFF:
+                return int(round(units)), index
+        raise ValueError(f"Interpolation time period로 표현할 수 없는 주기입니다: {dt}")
+
+    def _write_interpolation_period(self):
+        """Interpolation time period(0x60C2)를 SYNC 주기(self.dt)에 맞춘다"""
+        units, index = self._interpolation_period(self.dt)
+        self.node.sdo[0x60C2][1].raw = units
+        self.node.sdo[0x60C2][2].raw = index
+        print(f'[write] Interpolation time period: {units}e{index} s')
+
+    def set_dt(self, value=0.01):
+        changed = value != self.dt
+        super().set_dt(value)
+        # cyclic 모드는 drive의 보간 주기를 SYNC 주기와 맞춰야 한다
+        if changed and self._initialized and self.operation_mode in self.CYCLIC_MODES:
+            self._write_interpolation_period()
+
     def reset(self):
         print(f"[MotorVendorZeroErr] Reset motor node: {self.node_id}")
-        self.node.sdo[0x6040].raw = 0x27
-        time.sleep(0.1)
-        self.node.sdo[0x6040].raw = 0x26    
-        time.sleep(0.1)
-        self.node.sdo[0x6040].raw = 0x80  # 에러 클리어
-        time.sleep(0.1)
-        pass
-
-    def log_start(self):
-        """로그 시작"""
-        self.logging = True
-        self.start_time = time.time()
+        statusword = self.node.sdo[0x6041].raw
+        # (Controlword, 전이 후 기대 상태) - 드라이브 상태 기계가 따라온 것을 확인한 뒤 다음 Controlword를 쓴다
+        for controlword, state in ((0x27, self.STATE_SWITCHED_ON),
+                                   (0x26, self.STATE_READY_TO_SWITCH_ON),
+                                   (0x80, self.STATE_SWITCH_ON_DISABLED)):  # 0x80: 에러 클리어
+            self.node.sdo[0x6040].raw = controlword
+            if controlword != 0x80 and statusword & self.STATUS_FAULT:
+                continue  # fault 상태에서는 fault reset만 유효
+            if controlword == 0x27 and self._in_state(statusword, self.STATE_SWITCH_ON_DISABLED):
+                continue  # switch on disabled에서 바로 switched on으로 가는 전이는 없음
+            statusword = self._wait_state(state)
+
+    @staticmethod
+    def _in_state(statusword, state):
+        mask, value = state
+        return statusword & mask == value
+
+    def _wait_state(self, state, timeout=None):
+        """Statusword(0x6041)를 SDO로 조회하며 state (mask, value)가 될 때까지 대기
+        :return: 마지막으로 읽은 Statusword (timeout이면 경고 출력 후 그대로 반환)
+        """
+        timeout = self.STATE_TIMEOUT if timeout is None else timeout
+        deadline = self.clock.monotonic() + timeout
+        while True:
+            statusword = self.node.sdo[0x6041].raw
+            if self._in_state(statusword, state):
+                return statusword
+            if self.clock.monotonic() >= deadline:
+                print(f"[MotorVendorZeroErr] Statusword timeout, node: {self.node_id}, "
+                      f"statusword: {hex(statusword)}, expected: {hex(state[1])}")
+                return statusword
+            self.clock.sleep(self.STATE_POLL)
+
+    # 로그 열 (이름, 단위)
+    LOG_COLUMNS = (('Time', 'ms'), ('Position', 'rad'), ('Torque', 'Nm'), ('Velocity', 'rad/s'),
+                   ('Acceleration', 'rad/s^2'))
+
+    def log_start(self, capacity=65536, flush_interval=0.1, log_format='binary'):
+        """로그 시작
+        TPDO2 수신 시 샘플을 링 버퍼에 넣기만 하고, 파일 기록은 백그라운드 스레드에서 한다.
+        :param capacity: 버퍼에 담을 최대 샘플 수 (가득 차면 새 샘플은 버리고 dropped 증가)
+        :param flush_interval: 파일 기록 주기[s]
+        :param log_format: 'binary'(.bin, binary_log.read_log로 읽고 log_to_csv로 변환) 또는 'csv'
+        """
+        self.log_stop()
+        self.start_time = self.clock.time()
         
         # 현재 시간을 이용한 파일명 생성
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_filename = f"motor_log_{self.node_id}_{timestamp}.csv"
-        
-        # CSV 파일 생성 및 헤더 작성
-        self.log_file = open(self.log_filename, 'w', newline='')
-        self.csv_writer = csv.writer(self.log_file)
-        self.csv_writer.writerow(['Time(ms)', 'Position(rad)', 'Torque(Nm)', 'Velocity(rad/s)', 'Acceleration(rad/s^2)'])
+        names = [name for name, unit in self.LOG_COLUMNS]
+        units = [unit for name, unit in self.LOG_COLUMNS]
+        if log_format == 'binary':
+            self.log_filename = f"motor_log_{self.node_id}_{timestamp}.bin"
+            writer = BinaryLogWriter(self.log_filename, names, units,
+                                     [None] + [self.node_id] * (len(names) - 1), self.dt)
+        elif log_format == 'csv':
+            self.log_filename = f"motor_log_{self.node_id}_{timestamp}.csv"
+            writer = CsvLogWriter(self.log_filename, [f"{name}({unit})" for name, unit in self.LOG_COLUMNS])
+        else:
+            raise ValueError(f"지원하지 않는 로그 형식입니다: {log_format}")
 
-    def log_stop(self):
-        """로그 종료"""
-        if hasattr(self, 'logging') and self.logging:
-            self.logging = False
-            self.log_file.close()
+        logger = RingBufferLogger(writer, len(names), capacity, flush_interval)
+        logger.start(self.start_time)
+        self.logger = logger
 
-    def pdo_mapping(self):
+    def log_stop(self):
+        """로그 종료 (남은 샘플을 모두 기록한 뒤 파일을 닫음)"""
+        logger = self.logger
+        if logger is not None:
+            self.logger = None
+            logger.stop()
+
+    def get_log_stats(self):
+        """로그 통계 (기록/버린 샘플 수, 버퍼가 가득 찬 횟수, 대기 중인 샘플 수), 로그 중이 아니면 None"""
+        if self.logger is None:
+            return None
+        return self.logger.get_stats()
+
+    def _pdo_layout(self):
+        """원하는 PDO 구성 (PDO 종류, 번호, COB-ID 기준값, 전송 타입, 매핑 변수 목록)"""
+        # profile 모드는 즉시 적용(0), cyclic 모드는 다음 SYNC에 적용(1)
+        rpdo_trans_type = 1 if self.operation_mode in self.CYCLIC_MODES else 0
+        return [
+            # master <- motor
+            ('tpdo', 1, 0x180, 1, ['Statusword', 'Position actual value']),           # 읽기 : 상태 값, 위치
+            ('tpdo', 2, 0x280, 1, ['Torque sensor', 'Velocity actual value']),        # 읽기 : 토크 센서(0x3B69, mN.m), 속도(0x606C, plus/s)
+            # motor <- master
+            ('rpdo', 1, 0x200, rpdo_trans_type, ['Controlword', 'Target Position']),  # 쓰기 : 위치 목표값
+            ('rpdo', 2, 0x300, rpdo_trans_type, ['Controlword', 'Target torque']),    # 쓰기 : 토크 목표값(0x6071)
+            ('rpdo', 3, 0x400, rpdo_trans_type, ['Controlword', 'Target velocity']),  # 쓰기 : 속도 목표값(0x60FF, plus/s)
+        ]
+
+    def _pdo_matches(self, kind, pdo_map, cob_id, trans_type, variables):
+        """드라이브에서 읽어온 PDO 설정이 원하는 구성과 같은지 확인"""
+        if not pdo_map.enabled or pdo_map.cob_id != cob_id or pdo_map.trans_type != trans_type:
+            return False
+        # _configure_pdo는 TPDO event timer를 0으로 쓰므로 0이 아니면 다시 써야 한다
+        if kind == 'tpdo' and self._tpdo_event_timer(pdo_map):
+            return False
+        actual = [(var.index, var.subindex, var.length) for var in pdo_map.map]
+        desired = []
+        for name in variables:
+            od = self.node.object_dictionary[name]
+            desired.append((od.index, od.subindex, len(od)))
+        return actual == desired
+
+    @staticmethod
+    def _tpdo_event_timer(pdo_map):
+        """드라이브의 TPDO event timer[ms] (PdoMap.read()는 전송 타입 254/255일 때만 읽으므로 직접 조회)"""
+        try:
+            return pdo_map.com_record[5].raw
+        except (KeyError, canopen.SdoAbortedError):
+            return 0  # event timer 항목이 없는 드라이브
+
+    def _configure_pdo(self, kind, pdo_map, cob_id, trans_type, variables):
+        pdo_map.clear()
+        for name in variables:
+            pdo_map.add_variable(name)
+        pdo_map.cob_id = cob_id
+        pdo_map.trans_type = trans_type
+        if kind == 'tpdo':
+            pdo_map.event_timer = 0
+        pdo_map.enabled = True
+
+    def _build_rpdo_encoders(self):
+        """RPDO 매핑으로부터 setpoint 인코더 생성 (실패하면 PdoMap.transmit() 경로 사용)"""
+        for number, target in self.RPDO_TARGETS.items():
+            try:
+                self._rpdo_encoders[number] = PdoEncoder(self.node.rpdo[number], ('Controlword', target))
+            except ValueError as e:
+                print(f"[MotorVendorZeroErr] RPDO{number} encoder unavailable, node: {self.node_id} ({e})")
+                self._rpdo_encoders[number] = None
+
+    def pdo_mapping(self, verify=True):
+        """PDO 매핑 설정
+        :param verify: True면 드라이브의 통신/매핑 파라미터(0x1400~0x1A03)를 읽어 비교하고
+                       다른 PDO만 다시 쓴다. False면 항상 모든 PDO를 다시 쓴다.
+        :return: 새로 쓴 PDO 이름 목록 (이미 설정되어 있으면 빈 리스트)
+        """
         print(f"[MotorVendorZeroErr] PDO mapping for node: {self.node_id}")
-        # Read PDO configuration from node
-        self.node.tpdo.read()
-        self.node.rpdo.read()
-
-        # master <- motor
-        # 읽기 : 상태 값, 토크 센서 값
-        self.node.tpdo[1].clear()
-        self.node.tpdo[1].add_variable('Statusword')
-        self.node.tpdo[1].add_variable('Position actual value')
-        self.node.tpdo[1].cob_id = 0x180 + self.node_id
-        self.node.tpdo[1].trans_type = 1
-        self.node.tpdo[1].event_timer = 0
-        self.node.tpdo[1].enabled = True
-
-        # 읽기 : 속도, 위치
-        self.node.tpdo[2].clear()
-        self.node.tpdo[2].add_variable('Torque sensor') #0x3B69, mN.m
-        self.node.tpdo[2].add_variable('Velocity actual value') #0x606C, plus/s            
-        self.node.tpdo[2].cob_id = 0x280 + self.node_id
-        self.node.tpdo[2].trans_type = 1
-        self.node.tpdo[2].event_timer = 0
-        self.node.tpdo[2].enabled = True
-
-        # motor <- master
-        # 쓰기 : 위치 목표값
-        self.node.rpdo[1].clear()
-        self.node.rpdo[1].add_variable('Controlword')
-        self.node.rpdo[1].add_variable('Target Position')
-        self.node.rpdo[1].cob_id = 0x200 + self.node_id
-        self.node.rpdo[1].trans_type = 0  # 즉시 적용
-        #self.node.rpdo[1].event_timer = 255   # 이벤트 타이머 비활성화
-        self.node.rpdo[1].enabled = True
-
-        # 쓰기 : 토크 목표값
-        self.node.rpdo[2].clear() 
-        self.node.rpdo[2].add_variable('Controlword')
-        self.node.rpdo[2].add_variable('Target torque') #0x6071 
-        self.node.rpdo[2].cob_id = 0x300 + self.node_id
-        self.node.rpdo[2].trans_type = 0  # 즉시 적용
-        #self.node.rpdo[1].event_timer = 255   # 이벤트 타이머 비활성화
-        self.node.rpdo[2].enabled = True
-
-        self.motor_rated_current = self.node.sdo['Motor rated current'].raw #0x6075 모터 정격 전류 mA
-        print(f'[read] Motor rated current: {self.motor_rated_current}')
-        
+        if not verify:
+            # Read PDO configuration from node
+            self.node.tpdo.read()
+            self.node.rpdo.read()
+
+        changed = []
+        for kind, number, cob_base, trans_type, variables in self._pdo_layout():
+            pdo_map = getattr(self.node, kind)[number]
+            cob_id = cob_base + self.node_id
+            if verify:
+                pdo_map.read()
+                if self._pdo_matches(kind, pdo_map, cob_id, trans_type, variables):
+                    continue
+            self._configure_pdo(kind, pdo_map, cob_id, trans_type, variables)
+            changed.append(pdo_map)
+
+        if getattr(self, 'motor_rated_current', None) is None:
+            self.motor_rated_current = self.node.sdo['Motor rated current'].raw #0x6075 모터 정격 전류 mA
+            print(f'[read] Motor rated current: {self.motor_rated_current}')
+
+        self._build_rpdo_encoders()
+
+        if not changed:
+            print(f"[MotorVendorZeroErr] PDO mapping already configured, node: {self.node_id}")
+            return []
+
         # Save new configuration (node must be in pre-operational)
         self.node.nmt.state = 'PRE-OPERATIONAL'
-        self.node.tpdo.save()
-        self.node.rpdo.save()
+        for pdo_map in changed:
+            pdo_map.save()
 
         # Start remote node
         self.node.nmt.state = 'OPERATIONAL'
-        pass
+        return [pdo_map.name for pdo_map in changed]
+
+    def pdo_mapping_local(self):
+        """드라이브와 통신하지 않고 _pdo_layout 구성을 로컬 PdoMap에만 적용
+        (버스 없이 기록된 로그를 재생할 때 TPDO 디코딩/RPDO 인코더를 준비하는 용도)
+        """
+        for kind, number, cob_base, trans_type, variables in self._pdo_layout():
+            self._configure_pdo(kind, getattr(self.node, kind)[number], cob_base + self.node_id, trans_type, variables)
+        self._build_rpdo_encoders()
 
     def set_switchOn(self):
         print(f"[MotorVendorZeroErr] Set switch on, node: {self.node_id}")
@@ -150,30 +327,134 @@ class MotorVendorZeroErr(AbstractMotor):
         self.node.rpdo[1].transmit()
         self.network.sync.transmit()"""
         
-        time.sleep(0.001)
-        self.node.rpdo[1]['Controlword'].phys = 0x2f
+        if self.operation_mode == 'CYCLIC_SYNC_POSITION':
+            # 목표값은 init에서 실제 위치로 맞춰둠
+            self._send_rpdo(1, self.CSP_CONTROLWORD, self.target_position)
+            return
+        if self.operation_mode == 'CYCLIC_SYNC_VELOCITY':
+            self._send_rpdo(3, self.CSP_CONTROLWORD, 0)
+            return
+        if self.operation_mode == 'CYCLIC_SYNC_TORQUE':
+            self._send_rpdo(2, self.CSP_CONTROLWORD, 0)
+            return
+
+        self.clock.sleep(0.001)
+        self._send_rpdo(1, 0x2f, self.target_position)
         # self.node.rpdo[1]['Target Position'].phys = self.node.sdo['Position actual value'].raw
-        self.node.rpdo[1].transmit()
-        time.sleep(0.001)
+        self.clock.sleep(0.001)
 
-        self.node.rpdo[1]['Controlword'].phys = 0x3f
-        self.node.rpdo[1].transmit()        
-        time.sleep(0.001)
+        self._send_rpdo(1, 0x3f, self.target_position)
+        self.clock.sleep(0.001)
 
         pass
 
-    def pdo_callback_register(self):
+    def _send_rpdo(self, number, controlword, target):
+        """RPDO(Controlword, 목표값) 한 프레임 전송"""
+        encoder = self._rpdo_encoders[number]
+        if encoder is not None:
+            encoder.send(controlword, self._raw_target(target))
+            return
+        rpdo = self.node.rpdo[number]
+        rpdo['Controlword'].phys = controlword
+        rpdo[self.RPDO_TARGETS[number]].phys = target
+        rpdo.transmit()
+
+    def pdo_callback_register(self, fast=True):
+        """TPDO 수신 콜백 등록
+        :param fast: True면 매핑으로부터 만든 struct로 원시 프레임을 직접 디코딩한다.
+                     (canopen PdoMap의 변수별 디코딩을 거치지 않음)
+        """
+        # RPDO는 보내기만 하므로 PdoMap.save()가 구독한 RPDO COB-ID 수신은 해제한다 (수신 필터에서도 빠짐)
+        for number in self.RPDO_TARGETS:
+            pdo_map = self.node.rpdo[number]
+            if pdo_map.on_message in self.network.subscribers.get(pdo_map.cob_id, ()):
+                self.network.unsubscribe(pdo_map.cob_id, pdo_map.on_message)
+
+        # 사이클 스냅샷은 TPDO1, TPDO2가 모두 수신되어야 완성된다
+        self._tpdo1_bit = self.state.rx_bit(self.slot, 0)
+        self._tpdo2_bit = self.state.rx_bit(self.slot, 1)
+        if fast:
+            try:
+                tpdo1 = PdoDecoder(self.node.tpdo[1])
+                tpdo2 = PdoDecoder(self.node.tpdo[2])
+                self._tpdo1_unpack = tpdo1.unpack
+                self._tpdo1_statusword = tpdo1.index('Statusword')
+                self._tpdo1_position = tpdo1.index('Position actual value')
+                self._tpdo2_unpack = tpdo2.unpack
+                self._tpdo2_torque = tpdo2.index('Torque sensor')
+                self._tpdo2_velocity = tpdo2.index('Velocity actual value')
+            except ValueError as e:
+                print(f"[MotorVendorZeroErr] Fast TPDO decode unavailable, node: {self.node_id} ({e})")
+                fast = False
+
+        if fast:
+            for pdo_map, handler in ((self.node.tpdo[1], self._on_tpdo1), (self.node.tpdo[2], self._on_tpdo2)):
+                # 매핑이 이미 맞아 save()를 건너뛴 경우 on_message는 구독된 적이 없다
+                if pdo_map.on_message in self.network.subscribers.get(pdo_map.cob_id, ()):
+                    self.network.unsubscribe(pdo_map.cob_id, pdo_map.on_message)
+                self.network.subscribe(pdo_map.cob_id, handler)
+            return
+
         self.network.subscribe(self.node.tpdo[1].cob_id, self.node.tpdo[1].on_message)
         self.node.tpdo[1].add_callback(self.tpdo1_callback)
 
         self.network.subscribe(self.node.tpdo[2].cob_id, self.node.tpdo[2].on_message)
         self.node.tpdo[2].add_callback(self.tpdo2_callback)
 
+    @staticmethod
+    def _raw_target(value):
+        # canopen의 .phys 인코딩과 같이 정수 타입은 반올림
+        return value if type(value) is int else int(round(value))
+
+    def _streaming_controlword(self):
+        """STREAMING 모드의 Controlword 계산
+        new set-point(bit 4)를 올린 뒤 drive가 acknowledge(Statusword bit 12)하면 bit 4를 내리고,
+        acknowledge가 내려가면 다시 올려 다음 목표값을 받아들이게 한다. (사이클당 한 프레임)
+        엣지 사이에 bit 4를 내리는 프레임이 끼므로 latch는 최대 두 사이클에 한 번이다.
+        매 프레임 목표값을 적용하려면 CYCLIC_SYNC_POSITION 모드를 사용한다.
+        """
+        ack = self.statusword & self.SETPOINT_ACK
+        if self._new_setpoint:
+            if ack:
+                self._new_setpoint = False
+                self.setpoint_acks += 1
+        elif not ack:
+            self._new_setpoint = True
+        return (0x2f | self.NEW_SETPOINT) if self._new_setpoint else 0x2f
+
     def set_position(self, value):
         #print(f"[MotorVendorZeroErr] Set position to {value}, node: {self.node_id}")
+        target = value + self.zero_offset
+        self.target_position = target
+        self.send_target_position(target)
+
+    def send_target_position(self, target):
+        """zero offset이 적용된 목표 위치[plus]를 동작 모드/setpoint 방식에 맞는 프레임으로 전송"""
+        if self.latency is not None:
+            state = self.state
+            # CSP는 다음 SYNC 이후의 피드백, profile position은 set-point acknowledge 엣지가 응답
+            if self.operation_mode == 'CYCLIC_SYNC_POSITION':
+                response = 'sync'
+            else:
+                response = 'ack' if self.setpoint_mode == 'STREAMING' else 'any'
+            self.latency.on_send(self.clock.time(), state.sync_count, state.sync_time, response)
+        if self.operation_mode == 'CYCLIC_SYNC_POSITION':
+            # 다음 SYNC에 적용되는 목표값 한 프레임
+            self._send_rpdo(1, self.CSP_CONTROLWORD, target)
+            return
+        if self.setpoint_mode == 'STREAMING':
+            self._send_rpdo(1, self._streaming_controlword(), target)
+            return
+
+        encoder = self._rpdo_encoders[1]
+        if encoder is not None:
+            target = self._raw_target(target)
+            encoder.send(0x2f, target)
+            encoder.send(0x3f, target)
+            return
+
         self.node.rpdo[1]['Controlword'].phys = 0x2f
-        self.target_position = value + self.zero_offset
-        self.node.rpdo[1]['Target Position'].phys = self.target_position
+        self.node.rpdo[1]['Target Position'].phys = target
         self.node.rpdo[1].transmit()
 
         #print(f"myzero_offset {self.zero_offset} , target_position {self.target_position}")
@@ -187,17 +468,22 @@ class MotorVendorZeroErr(AbstractMotor):
         # print(f"[MotorVendorZeroErr] Get position, node: {self.node_id}, position: {self.current_position}")
         return self.current_position
     
-    def set_torque(self, value):        
-        self.target_torque = value * 1000 / self.motor_rated_current # mA
-
-        print(f"[MotorVendorZeroErr] Set torque to {self.target_torque}, node: {self.node_id}")
-        self.node.rpdo[1]['Controlword'].phys = 0x2f
+    def set_torque(self, value):
+        """모터 토크 명령 (Target torque 0x6071, 정격 토크의 1/1000 단위)"""
         self.target_torque = value
-        self.node.rpdo[1]['Target torque'].phys = self.target_torque
-        self.node.rpdo[1].transmit()
+        self.send_target_torque(value)
 
-        self.node.rpdo[1]['Controlword'].phys = 0x3f
-        self.node.rpdo[1].transmit()       
+    def send_target_torque(self, target):
+        """목표 토크를 동작 모드에 맞는 프레임으로 전송"""
+        if self.latency is not None:
+            self.latency.on_send(self.clock.time(), self.state.sync_count, self.state.sync_time)
+        if self.operation_mode == 'CYCLIC_SYNC_TORQUE':
+            # 다음 SYNC에 적용되는 목표값 한 프레임
+            self._send_rpdo(2, self.CSP_CONTROLWORD, target)
+            return
+
+        self._send_rpdo(2, 0x2f, target)
+        self._send_rpdo(2, 0x3f, target)
 
     def get_torque(self):
         return self.current_torque_sensor
@@ -208,43 +494,84 @@ class MotorVendorZeroErr(AbstractMotor):
     def get_acceleration(self):
         return self.current_acceleration
 
+    def _on_tpdo1(self, can_id, data, timestamp):
+        """TPDO1 원시 프레임 핸들러 (Statusword, Position actual value)"""
+        fields = self._tpdo1_unpack(data)
+        state = self.state
+        state.rx_begin(self._tpdo1_bit, timestamp)
+        state.rx_time[self.slot] = timestamp
+        state.rx_count[self.slot] += 1
+        state.statusword[self.slot] = fields[self._tpdo1_statusword]
+        self._update_position(fields[self._tpdo1_position])
+        state.rx_end(self._tpdo1_bit)
+        if self.latency is not None:
+            self.latency.on_feedback(timestamp, state.sync_count, fields[self._tpdo1_statusword])
+
+    def _on_tpdo2(self, can_id, data, timestamp):
+        """TPDO2 원시 프레임 핸들러 (Torque sensor, Velocity actual value)"""
+        fields = self._tpdo2_unpack(data)
+        state = self.state
+        state.rx_begin(self._tpdo2_bit, timestamp)
+        state.rx_time[self.slot] = timestamp
+        state.rx_count[self.slot] += 1
+        self._update_torque_velocity(fields[self._tpdo2_torque], fields[self._tpdo2_velocity], timestamp)
+        state.rx_end(self._tpdo2_bit)
+
     def tpdo1_callback(self, message):
         #position = message.data[2] | (message.data[3] << 8) | (message.data[4] << 16) | (message.data[5] << 24)
         #if position & 0x80000000:  # 최상위 비트가 1이면 음수
         #    position = -((~position + 1) & 0xFFFFFFFF)  # 2의 보수 처리
-        position = int.from_bytes(message.data[2:5], byteorder='little', signed=True)
-        self.current_position = (position - self.zero_offset) * self.plusToRad  # rad로 변환
-        #print(f'TPDO1 Position actual value: {self.current_position}')
+        self.state.rx_begin(self._tpdo1_bit, message.timestamp)
+        self.state.rx_time[self.slot] = message.timestamp
+        self.state.rx_count[self.slot] += 1
+        self.statusword = int.from_bytes(message.data[0:2], byteorder='little')
+        position = int.from_bytes(message.data[2:6], byteorder='little', signed=True)
+        self._update_position(position)
+        self.state.rx_end(self._tpdo1_bit)
+        if self.latency is not None:
+            self.latency.on_feedback(message.timestamp, self.state.sync_count, self.statusword)
 
     def tpdo2_callback(self, message):
-        current_torque = int.from_bytes(message.data[0:3], byteorder='little', signed=True)  
+        current_torque = int.from_bytes(message.data[0:4], byteorder='little', signed=True)  
+        pulse_velocity = int.from_bytes(message.data[4:8], byteorder='little', signed=True)
+        self.state.rx_begin(self._tpdo2_bit, message.timestamp)
+        self.state.rx_time[self.slot] = message.timestamp
+        self.state.rx_count[self.slot] += 1
+        self._update_torque_velocity(current_torque, pulse_velocity, message.timestamp)
+        self.state.rx_end(self._tpdo2_bit)
+
+    def _update_position(self, position):
+        # FleetState 배열에 바로 기록
+        self.state.position[self.slot] = (position - self.zero_offset) * self.plusToRad  # rad로 변환
+        #print(f'TPDO1 Position actual value: {self.current_position}')
 
-        self.current_torque_sensor = current_torque / 1000        
+    def _update_torque_velocity(self, current_torque, pulse_velocity, timestamp):
+        state = self.state
+        slot = self.slot
+        state.torque[slot] = current_torque / 1000        
         #print(f'TPDO2 Torque sensor: {self.current_torque_sensor}')
 
-
-        pulse_velocity = int.from_bytes(message.data[4:7], byteorder='little', signed=True)
-
-        self.current_velocity = pulse_velocity * self.plusToRad  # rad/s로 변환
+        velocity = pulse_velocity * self.plusToRad  # rad/s로 변환
+        state.velocity[slot] = velocity
         #print(f'TPDO2 Velocity actual value: {self.current_velocity} rad/s')
         
-        self.current_acceleration = (self.current_velocity - self.current_velocity_old) / self.dt
-        self.current_velocity_old = self.current_velocity
+        # 명목 SYNC 주기 대신 실제 수신 시각(하드웨어 timestamp를 지원하면 그 값)으로 추정
+        state.acceleration[slot] = self.estimator.update(velocity, timestamp, self.dt)
         #print(f'TPDO2 Acceleration: {self.current_acceleration} rad/s^2')
 
-        # 로깅이 활성화된 경우 데이터 저장
-        if hasattr(self, 'logging') and self.logging:
-            current_time = (time.time() - self.start_time) * 1000  # ms 단위로 변환
-            self.csv_writer.writerow([
-                f"{current_time:.1f}",
-                f"{self.current_position:.6f}",
-                f"{self.current_torque_sensor:.6f}",
-                f"{self.current_velocity:.6f}",
-                f"{self.current_acceleration:.6f}"
-            ])
+        # 로깅이 활성화된 경우 숫자 샘플만 버퍼에 넣는다 (형식 변환/파일 기록은 기록 스레드)
+        logger = self.logger
+        if logger is not None:
+            logger.push(self.clock.time(), state.position[slot], state.torque[slot], velocity, state.acceleration[slot])
 
     def set_velocity(self, value):
-        """모터 속도 명령"""
+        """모터 속도 명령 [rad/s] (CSV 모드에서 Target velocity 0x60FF로 전송)"""
+        self.target_velocity = value
+        if self.operation_mode == 'CYCLIC_SYNC_VELOCITY':
+            if self.latency is not None:
+                self.latency.on_send(self.clock.time(), self.state.sync_count, self.state.sync_time)
+            self._send_rpdo(3, self.CSP_CONTROLWORD, value / self.plusToRad)  # plus/s로 변환
+            return
         print(f"[MotorVendorZeroErr] Set velocity to {value}, node: {self.node_id}")
 
     def set_acceleration(self, value):
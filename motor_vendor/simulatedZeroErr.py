@@ -0,0 +1,402 @@
+import math
+import os
+
+import can
+import canopen
+from canopen import LocalNode
+from canopen.objectdictionary import ODVariable
+
+from motor_management.od_cache import default_od_cache
+from motor_management.clock import system_clock
+from motor_management.direct_bus import connect_direct
+
+# 저장소에 포함된 ZeroErr EDS
+DEFAULT_EDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'config', 'ZeroErr Driver_V1.5.eds')
+
+
+class SimulatedZeroErrDrive:
+    """ZeroErr 드라이브 시뮬레이터 (실제 드라이브 없이 MotorController를 시험/측정하기 위한 용도)
+
+    canopen LocalNode 위에서 동작하며 python-can 'virtual' 인터페이스 등 아무 버스에나 붙일 수 있다.
+    - SDO: LocalNode의 SDO 서버가 EDS 기본값과 시뮬레이터가 갱신하는 값으로 응답한다.
+    - NMT: Reset(0x81/0x82)에 boot-up(0x700+id)으로 응답하고, OPERATIONAL에서만 PDO를 주고받는다.
+    - PDO: 0x1400~/0x1600~, 0x1800~/0x1A00~에 기록된 통신/매핑 파라미터를 그대로 따른다.
+           (MotorVendorZeroErr.pdo_mapping이 SDO로 쓴 매핑)
+    - SYNC: 동기 RPDO(전송 타입 1~240)를 적용하고, 1차 지연 plant 모델을 한 스텝 진행한 뒤
+            동기 TPDO를 전송한다.
+
+    CiA 402 상태 전이 순서는 검사하지 않고 Controlword 패턴만으로 상태를 정한다.
+    """
+    # Controlword 패턴 → Statusword (switch on disabled / ready to switch on / switched on / operation enabled)
+    STATUS_DISABLED = 0x0250
+    STATUS_READY = 0x0231
+    STATUS_SWITCHED_ON = 0x0233
+    STATUS_ENABLED = 0x0237
+    TARGET_REACHED = 0x0400
+    SETPOINT_ACK = 0x1000  # Statusword bit 12: set-point acknowledge (profile position)
+    NEW_SETPOINT = 0x10    # Controlword bit 4: new set-point
+    FAULT_RESET = 0x80     # Controlword bit 7
+    POSITION_MODES = (0x01, 0x08)
+    VELOCITY_MODES = (0x03, 0x09)
+    TORQUE_MODES = (0x04, 0x0A)
+    # 통신/매핑 파라미터 index 범위 (RPDO, TPDO)
+    RPDO_COMM, RPDO_MAP = 0x1400, 0x1600
+    TPDO_COMM, TPDO_MAP = 0x1800, 0x1A00
+    PDO_NOT_VALID = 1 << 31
+
+    def __init__(self, network, node_id, eds_path=DEFAULT_EDS_PATH, position=0, time_constant=0.005,
+                 rated_current=3000, rated_torque=1000, od_cache=default_od_cache, clock=system_clock):
+        """
+        :param network: 연결된 canopen.Network (드라이브 쪽, 컨트롤러와 다른 버스 인스턴스)
+        :param node_id: 노드 ID
+        :param eds_path: EDS 파일 경로
+        :param position: 시작 위치[plus]
+        :param time_constant: 목표값을 따라가는 1차 지연 시정수[s]
+        :param rated_current: Motor rated current(0x6075) 값[mA]
+        :param rated_torque: 정격 토크[mN.m] (Target torque 1/1000 단위 → Torque sensor mN.m 변환)
+        :param od_cache: EDS 파싱 결과 캐시(ODCache). None이면 EDS를 새로 파싱
+        :param clock: 시각 기준. 가상 시계(VirtualClock)이면 SYNC 간격과 TPDO timestamp를 이 시계로 정한다
+        """
+        self.network = network
+        self.clock = clock
+        self.node_id = node_id
+        self.time_constant = time_constant
+        self.rated_torque = rated_torque
+        if od_cache is not None:
+            object_dictionary = od_cache.load(eds_path, node_id)
+        else:
+            object_dictionary = eds_path
+        self.node = LocalNode(node_id, object_dictionary)
+        self.od = self.node.object_dictionary
+        network.add_node(self.node)
+
+        # plant 상태 (드라이브 단위: plus, plus/s, 정격 토크의 1/1000)
+        self.position = float(position)
+        self.velocity = 0.0
+        self.torque = 0.0
+        self.syncs = 0        # 받은 SYNC 수
+        self.tpdo_sent = 0    # 보낸 TPDO 수
+        self.rpdo_received = 0  # 받은 RPDO 수
+
+        self._rpdos = []        # [(COB-ID, 전송 타입, [(index, subindex, offset, 길이)])]
+        self._tpdos = []        # [(COB-ID, 전송 타입, [(index, subindex, 길이)])]
+        self._rpdo_handlers = []  # [(COB-ID, handler)] (매핑을 다시 만들 때 해제)
+        self._pending_rpdo = {}   # {COB-ID: 다음 SYNC에 적용할 RPDO 데이터}
+        self._last_tpdo = {}      # {COB-ID: 전송 타입 0 TPDO의 마지막 데이터}
+        self._mapping_dirty = True
+        self._last_sync = None
+
+        self._store(0x6075, rated_current)
+        for index, subindex, value in ((0x60C2, 1, 1), (0x60C2, 2, -3), (0x1017, 0, 0)):
+            try:
+                self.node.get_data(index, subindex)
+            except canopen.SdoAbortedError:
+                self._store(index, value, subindex)
+        self._reset_application()
+
+        self.node.add_write_callback(self._on_write)
+        network.subscribe(0, self._on_nmt)
+        network.subscribe(0x80, self._on_sync)
+        self._boot()
+
+    def close(self):
+        """버스에서 분리 (구독 해제)"""
+        self._unsubscribe_rpdos()
+        self.network.unsubscribe(0, self._on_nmt)
+        self.network.unsubscribe(0x80, self._on_sync)
+        self.node.nmt.stop_heartbeat()
+        del self.network[self.node_id]
+
+    # ---- 객체 사전 ----
+
+    def _variable(self, index, subindex):
+        obj = self.od[index]
+        return obj if isinstance(obj, ODVariable) else obj[subindex]
+
+    def _store(self, index, value, subindex=0):
+        """write callback 없이 값을 data store에 기록 (읽기 전용 객체 갱신용)"""
+        self.node.data_store.setdefault(index, {})[subindex] = self._variable(index, subindex).encode_raw(value)
+
+    def _value(self, index, subindex=0):
+        return self._variable(index, subindex).decode_raw(self.node.get_data(index, subindex))
+
+    def _reset_application(self):
+        """전원 투입/Reset node 시 드라이브 상태 초기화 (PDO 설정은 저장된 값으로 유지)"""
+        self.velocity = 0.0
+        self.torque = 0.0
+        self.controlword = 0
+        self.mode = self._value(0x6060)
+        self.target_position = int(round(self.position))
+        self.target_velocity = 0
+        self.target_torque = 0
+        self._setpoint = self.target_position  # profile position에서 latch된 목표값
+        self._statusword = self.STATUS_DISABLED
+        self._pending_rpdo.clear()
+        self._last_tpdo.clear()
+        self._last_sync = None
+        for index, value in ((0x6040, 0), (0x607A, self.target_position), (0x60FF, 0), (0x6071, 0),
+                             (0x6061, self.mode)):
+            self._store(index, value)
+        self._update_outputs()
+
+    def _on_write(self, index, subindex, od, data, **kwargs):
+        """SDO 쓰기와 RPDO 적용 모두 이 callback을 거친다"""
+        if self.RPDO_COMM <= index < 0x1C00:
+            self._mapping_dirty = True
+        elif index == 0x6040:
+            self._on_controlword(od.decode_raw(data))
+        elif index == 0x607A:
+            self.target_position = od.decode_raw(data)
+        elif index == 0x60FF:
+            self.target_velocity = od.decode_raw(data)
+        elif index == 0x6071:
+            self.target_torque = od.decode_raw(data)
+        elif index == 0x6060:
+            self.mode = od.decode_raw(data)
+            self._store(0x6061, self.mode)
+
+    def _on_controlword(self, value):
+        previous = self.controlword
+        self.controlword = value
+        if value & self.FAULT_RESET or not value & 0x02 or not value & 0x04:
+            status = self.STATUS_DISABLED
+        elif value & 0x0F == 0x0F:
+            status = self.STATUS_ENABLED
+        elif value & 0x01:
+            status = self.STATUS_SWITCHED_ON
+        else:
+            status = self.STATUS_READY
+        if status != self.STATUS_ENABLED:
+            self._setpoint = int(round(self.position))
+        if self.mode == 0x01 and status == self.STATUS_ENABLED:
+            # profile position: new set-point 상승 엣지에서 목표값을 latch하고 acknowledge
+            if value & self.NEW_SETPOINT and not previous & self.NEW_SETPOINT:
+                self._setpoint = self.target_position
+                status |= self.SETPOINT_ACK
+            elif value & self.NEW_SETPOINT:
+                status |= self._statusword & self.SETPOINT_ACK
+        self._statusword = status
+        self._store(0x6041, self._statusword)
+
+    # ---- NMT ----
+
+    def _boot(self):
+        """boot-up 전송 후 PRE-OPERATIONAL 진입"""
+        self.node.nmt.send_command(0x81)
+        self.node.nmt.state = 'PRE-OPERATIONAL'
+
+    def _on_nmt(self, can_id, data, timestamp):
+        command, node_id = data[0], data[1]
+        if node_id not in (0, self.node_id):
+            return
+        if command in (0x81, 0x82):
+            # LocalNode의 NmtSlave는 Reset을 받아도 boot-up을 보내지 않으므로 여기서 처리
+            if command == 0x81:
+                self._reset_application()
+            self._boot()
+        elif command == 0x01:
+            self._build_mapping()
+
+    # ---- PDO ----
+
+    def _mapped_entries(self, map_index):
+        entries = []
+        for subindex in range(1, self._value(map_index, 0) + 1):
+            value = self._value(map_index, subindex)
+            entries.append((value >> 16, (value >> 8) & 0xFF, (value & 0xFF) // 8))
+        return entries
+
+    def _pdo_records(self, comm_base, map_base):
+        records = []
+        for number in range(512):
+            if comm_base + number not in self.od:
+                break
+            cob_id = self._value(comm_base + number, 1)
+            if cob_id & self.PDO_NOT_VALID:
+                continue
+            records.append((cob_id & 0x7FF, self._value(comm_base + number, 2),
+                            self._mapped_entries(map_base + number)))
+        return records
+
+    def _build_mapping(self):
+        """통신/매핑 파라미터로부터 PDO 목록을 다시 만들고 RPDO COB-ID 구독"""
+        self._mapping_dirty = False
+        self._unsubscribe_rpdos()
+        self._rpdos = []
+        for cob_id, trans_type, entries in self._pdo_records(self.RPDO_COMM, self.RPDO_MAP):
+            layout = []
+            offset = 0
+            for index, subindex, length in entries:
+                layout.append((index, subindex, offset, length))
+                offset += length
+            # Controlword는 목표값을 먼저 기록한 뒤 적용 (new set-point 엣지에서 새 목표값을 latch)
+            layout.sort(key=lambda entry: entry[0] == 0x6040)
+            self._rpdos.append((cob_id, trans_type, layout))
+
+            def handler(can_id, data, timestamp, trans_type=trans_type, layout=layout):
+                self._on_rpdo(can_id, data, trans_type, layout)
+
+            self.network.subscribe(cob_id, handler)
+            self._rpdo_handlers.append((cob_id, handler))
+        self._tpdos = self._pdo_records(self.TPDO_COMM, self.TPDO_MAP)
+        self._pending_rpdo.clear()
+        self._last_tpdo.clear()
+
+    def _unsubscribe_rpdos(self):
+        for cob_id, handler in self._rpdo_handlers:
+            self.network.unsubscribe(cob_id, handler)
+        self._rpdo_handlers = []
+
+    def _on_rpdo(self, can_id, data, trans_type, layout):
+        if self.node.nmt.state != 'OPERATIONAL':
+            return
+        self.rpdo_received += 1
+        if 1 <= trans_type <= 240:
+            # 동기 RPDO: 다음 SYNC에 적용 (마지막으로 받은 값)
+            self._pending_rpdo[can_id] = (bytes(data), layout)
+        else:
+            # 0과 이벤트 타입(254/255)은 바로 적용 (profile 모드의 Controlword 엣지 유지)
+            self._apply_rpdo(data, layout)
+
+    def _apply_rpdo(self, data, layout):
+        for index, subindex, offset, length in layout:
+            if offset + length <= len(data):
+                self.node.set_data(index, subindex, data[offset:offset + length])
+
+    # ---- SYNC ----
+
+    def _interpolation_period(self):
+        return self._value(0x60C2, 1) * 10.0 ** self._value(0x60C2, 2)
+
+    def _on_sync(self, can_id, data, timestamp):
+        if self._mapping_dirty:
+            self._build_mapping()
+        if self.node.nmt.state != 'OPERATIONAL':
+            self._last_sync = None
+            return
+        self.syncs += 1
+        pending = self._pending_rpdo
+        if pending:
+            for rpdo_data, layout in pending.values():
+                self._apply_rpdo(rpdo_data, layout)
+            pending.clear()
+
+        # 실제 SYNC 간격으로 plant를 진행 (첫 SYNC나 긴 공백 뒤에는 보간 주기 사용)
+        if not self.clock.realtime:
+            timestamp = self.clock.time()
+        last_sync = self._last_sync
+        self._last_sync = timestamp
+        dt = timestamp - last_sync if last_sync is not None else 0.0
+        if not 0.0 < dt < 0.1:
+            dt = self._interpolation_period()
+        self.step(dt)
+
+        for cob_id, trans_type, entries in self._tpdos:
+            if 1 <= trans_type <= 240:
+                if self.syncs % trans_type:
+                    continue
+            elif trans_type != 0:
+                continue
+            tpdo_data = b''.join(self.node.get_data(index, subindex)[:length]
+                                 for index, subindex, length in entries)
+            if trans_type == 0:
+                # 비주기 동기 TPDO: 값이 바뀐 경우에만 SYNC에 맞춰 전송
+                if self._last_tpdo.get(cob_id) == tpdo_data:
+                    continue
+                self._last_tpdo[cob_id] = tpdo_data
+            self._send(cob_id, tpdo_data)
+            self.tpdo_sent += 1
+
+    def _send(self, cob_id, data):
+        # timestamp를 시뮬레이터 시계로 찍어 보낸다 (가상 시계의 DirectBus도 같은 시각으로 찍는다)
+        msg = can.Message(arbitration_id=cob_id, data=data, is_extended_id=False, timestamp=self.clock.time())
+        with self.network.send_lock:
+            self.network.bus.send(msg)
+
+    def step(self, dt):
+        """plant 모델을 dt[s]만큼 진행 (목표값을 시정수 time_constant의 1차 지연으로 따라감)"""
+        alpha = 1.0 - math.exp(-dt / self.time_constant) if self.time_constant > 0 else 1.0
+        enabled = self._statusword & 0x0F == 0x07
+        mode = self.mode
+        status = self._statusword & ~self.TARGET_REACHED
+        if not enabled:
+            self.velocity = 0.0
+            self.torque = 0.0
+        elif mode in self.POSITION_MODES:
+            target = self._setpoint if mode == 0x01 else self.target_position
+            position = self.position + alpha * (target - self.position)
+            velocity = (position - self.position) / dt
+            if mode == 0x01:
+                limit = self._value(0x6081)
+                if limit and abs(velocity) > limit:
+                    velocity = math.copysign(limit, velocity)
+                    position = self.position + velocity * dt
+            self.position = position
+            self.velocity = velocity
+            self.torque = 0.0
+            if abs(target - position) < 1.0:
+                status |= self.TARGET_REACHED
+        elif mode in self.VELOCITY_MODES:
+            self.velocity += alpha * (self.target_velocity - self.velocity)
+            self.position += self.velocity * dt
+            self.torque = 0.0
+        elif mode in self.TORQUE_MODES:
+            self.torque += alpha * (self.target_torque - self.torque)
+            self.velocity = 0.0
+        self._statusword = status
+        self._update_outputs()
+
+    def _update_outputs(self):
+        torque = int(round(self.torque))
+        self._store(0x6041, self._statusword)
+        self._store(0x6064, int(round(self.position)))
+        self._store(0x606C, int(round(self.velocity)))
+        self._store(0x6077, torque)
+        self._store(0x3B69, int(round(self.torque * self.rated_torque / 1000)))
+
+
+class SimulatedZeroErrNetwork:
+    """여러 SimulatedZeroErrDrive를 하나의 버스 연결(canopen.Network)에 올린 묶음
+
+    예) 'virtual' 인터페이스에서 컨트롤러와 같은 channel을 쓰면 실제 하드웨어 없이 전체 bring-up을 시험할 수 있다.
+        with SimulatedZeroErrNetwork('sim0', [1, 2, 3]):
+            controller = MotorController(channel='sim0', interface='virtual')
+    """
+
+    def __init__(self, channel='sim0', node_ids=(1,), interface='virtual', bitrate=1000000, clock=system_clock,
+                 **kwargs):
+        """
+        :param channel: 버스 channel (컨트롤러와 같은 값)
+        :param node_ids: 시뮬레이션할 노드 ID 목록
+        :param interface: python-can 인터페이스
+        :param clock: 시각 기준 (가상 시계는 컨트롤러와 같은 객체를 넘긴다)
+        :param kwargs: SimulatedZeroErrDrive 인자 (eds_path, time_constant 등)
+        """
+        self.network = canopen.Network()
+        if interface == 'virtual' and not clock.realtime:
+            # 가상 시계: 컨트롤러와 같은 DirectBus channel에 붙어 SYNC를 받은 스레드에서 바로 TPDO를 전달
+            connect_direct(self.network, channel, clock)
+        else:
+            self.network.connect(interface=interface, channel=channel, bitrate=bitrate)
+        self.drives = {}
+        try:
+            for node_id in node_ids:
+                self.drives[node_id] = SimulatedZeroErrDrive(self.network, node_id, clock=clock, **kwargs)
+        except Exception:
+            self.network.disconnect()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, node_id):
+        return self.drives[node_id]
+
+    def close(self):
+        for drive in self.drives.values():
+            drive.node.nmt.stop_heartbeat()
+        self.network.disconnect()